@@ -0,0 +1,171 @@
+import json, os, socket, tempfile
+from random import Random
+from time import perf_counter
+import numpy as np
+from benchmarks.harness import benchmark, BenchmarkSkipped
+from pioneersim.managers import ObjectsManager
+from pioneersim.simulation import scenario
+from pioneersim.simulation.engine import PhysicsEngine
+from pioneersim.simulation.generator import generate
+from pioneersim.simulation.headless import HeadlessSettingManager, HeadlessWorld
+from pioneersim.simulation.thermal import FireIndex, ThermalRaster
+from pioneersim.utils import ModelType
+from pymavlink.dialects.v20 import common
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOUNDS = (0.0, 0.0, 24.0, 24.0)
+HOSTNAME = '127.0.0.1'
+FIRST_PORT = 20000
+
+def settings() -> HeadlessSettingManager:
+    with open(os.path.join(ROOT, 'settings', 'settings.json'), 'r') as f:
+        data = json.load(f)
+    data['simulation']['engine']['lockstep'] = True
+    data['simulation']['engine']['shards'] = 0
+    data['simulation']['engine']['state_capacity'] = 0
+    setting_manager = HeadlessSettingManager()
+    setting_manager.update_from_dict(data)
+    return setting_manager
+
+def simulation(drones : int, fires = 0) -> ObjectsManager:
+    objects_manager = ObjectsManager(HeadlessWorld(settings()))
+    objects = generate(drones, BOUNDS, 'grid', 0.5, fires, hostname=HOSTNAME, port=FIRST_PORT, seed=1)
+    objects_manager.add_objects(objects)
+    objects_manager.start()
+    return objects_manager
+
+def shutdown(objects_manager : ObjectsManager):
+    objects_manager.close()
+    engine = objects_manager.model_managers[ModelType.DRONEMAVLINK].engine
+    for _ in range(600):
+        if not engine.used.any():
+            break
+        objects_manager.step(1)
+    objects_manager.step(1)
+
+def fires(count : int, rng : Random) -> list:
+    model = ModelType.FIRE.model
+    return [model(index, rng.uniform(0, BOUNDS[2]), rng.uniform(0, BOUNDS[3])) for index in range(count)]
+
+@benchmark('message_dispatch')
+def message_dispatch(scale : float):
+    drones = max(int(100 * scale), 1)
+    objects_manager = simulation(drones)
+    manager = objects_manager.model_managers[ModelType.DRONEMAVLINK]
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.setblocking(False)
+    mav = common.MAVLink(None, 255, 190)
+    ports = [drone.port for drone in objects_manager.objects]
+    latencies = []
+    try:
+        for round in range(20):
+            for port in ports:
+                message = common.MAVLink_command_long_message(1, 1, 31010, 0, 0, round % 255, 0, 0, 0, 0, 0).pack(mav)
+                start = perf_counter()
+                client.sendto(message, (HOSTNAME, port))
+                while True:
+                    manager.reactor.poll(0.01)
+                    try:
+                        client.recv(65535)
+                        break
+                    except BlockingIOError:
+                        pass
+                latencies.append(perf_counter() - start)
+    finally:
+        client.close()
+        shutdown(objects_manager)
+    return latencies, len(latencies)
+
+@benchmark('motion_step')
+def motion_step(scale : float):
+    drones = max(int(1000 * scale), 1)
+    rng = np.random.default_rng(1)
+    engine = PhysicsEngine(60, drones, lockstep=True, acceleration=1.0, yaw_acceleration=180.0)
+    slots = [engine.add(*rng.uniform(0, 24, 2), 1.0, 0.0, 50) for _ in range(drones)]
+    latencies = []
+    for tick in range(600):
+        for slot in slots:
+            if not engine.busy(slot):
+                engine.move(slot, *rng.uniform(0, 24, 2), rng.uniform(0.5, 2.0))
+        start = perf_counter()
+        engine.step()
+        latencies.append(perf_counter() - start)
+    for slot in slots:
+        engine.remove(slot)
+    return latencies, len(latencies) * drones
+
+@benchmark('position_fanout')
+def position_fanout(scale : float):
+    drones = max(int(300 * scale), 1)
+    objects_manager = simulation(drones, fires=max(int(200 * scale), 1))
+    manager = objects_manager.model_managers[ModelType.DRONEMAVLINK]
+    models = [drone.model for drone in objects_manager.objects.by_type(ModelType.DRONEMAVLINK.model)]
+    latencies = []
+    try:
+        for _ in range(200):
+            for model in models:
+                manager.render.mark_position(model)
+            start = perf_counter()
+            manager.render.flush()
+            latencies.append(perf_counter() - start)
+    finally:
+        shutdown(objects_manager)
+    return latencies, len(latencies) * drones
+
+def temperature(thermal, scale : float):
+    rng = Random(1)
+    for fire in fires(max(int(1000 * scale), 1), rng):
+        thermal.add(fire)
+    points = [(rng.uniform(0, BOUNDS[2]), rng.uniform(0, BOUNDS[3])) for _ in range(1000)]
+    latencies = []
+    for _ in range(20):
+        start = perf_counter()
+        for x, y in points:
+            thermal.get_temp(x, y)
+        latencies.append(perf_counter() - start)
+    return latencies, len(latencies) * len(points)
+
+@benchmark('fire_index_temp')
+def fire_index_temp(scale : float):
+    return temperature(FireIndex(0.5, 20.0, False), scale)
+
+@benchmark('fire_raster_temp')
+def fire_raster_temp(scale : float):
+    return temperature(ThermalRaster(BOUNDS[2], BOUNDS[3], 0.05, 0.5, 20.0, 60.0, False), scale)
+
+@benchmark('status_refresh')
+def status_refresh(scale : float):
+    try:
+        from PyQt5.QtCore import QCoreApplication
+        from pioneersim.widgets.status import StatusTableModel
+    except ImportError as e:
+        raise BenchmarkSkipped(e)
+    application = QCoreApplication.instance() or QCoreApplication([])
+    drones = max(int(300 * scale), 1)
+    objects_manager = simulation(drones)
+    manager = objects_manager.model_managers[ModelType.DRONEMAVLINK]
+    model = StatusTableModel(objects_manager)
+    latencies = []
+    try:
+        for _ in range(50):
+            manager.step(1)
+            start = perf_counter()
+            model.refresh()
+            latencies.append(perf_counter() - start)
+    finally:
+        shutdown(objects_manager)
+    return latencies, len(latencies)
+
+@benchmark('scenario_load')
+def scenario_load(scale : float):
+    objects = generate(max(int(1000 * scale), 1), BOUNDS, 'grid', 0.5, max(int(4000 * scale), 1), max(int(500 * scale), 1), HOSTNAME, FIRST_PORT, 1, False)
+    latencies = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'save.json')
+        scenario.write(path, objects)
+        for _ in range(5):
+            objects_manager = ObjectsManager(HeadlessWorld(settings()))
+            start = perf_counter()
+            objects_manager.add_objects(scenario.read(path))
+            latencies.append(perf_counter() - start)
+    return latencies, len(latencies) * len(objects)
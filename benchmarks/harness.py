@@ -0,0 +1,46 @@
+from contextlib import redirect_stdout
+from importlib import import_module
+from io import StringIO
+from statistics import median
+
+class BenchmarkSkipped(Exception):
+    pass
+
+__benchmarks = {}
+
+def benchmark(name : str):
+    def decorator(function):
+        __benchmarks[name] = function
+        return function
+    return decorator
+
+def get_benchmarks() -> dict:
+    import_module('benchmarks.cases')
+    return dict(__benchmarks)
+
+def percentile(values : list, fraction : float) -> float:
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def measure(function, scale : float) -> dict:
+    with redirect_stdout(StringIO()):
+        latencies, ops = function(scale)
+    latencies = sorted(latencies)
+    return {
+        'ops' : ops,
+        'samples' : len(latencies),
+        'throughput' : round(ops / sum(latencies), 3),
+        'p50_ms' : round(percentile(latencies, 0.50) * 1000, 4),
+        'p95_ms' : round(percentile(latencies, 0.95) * 1000, 4),
+        'p99_ms' : round(percentile(latencies, 0.99) * 1000, 4)
+    }
+
+def combine(results : list[dict]) -> dict:
+    return {key : median(result[key] for result in results) for key in results[0]}
+
+def compare(result : dict, baseline : dict, threshold : float, floor_ms = 0.05) -> list[str]:
+    regressions = []
+    if result['throughput'] < baseline['throughput'] * (1 - threshold):
+        regressions.append(f"throughput {result['throughput']} < {baseline['throughput']}")
+    if result['p95_ms'] > baseline['p95_ms'] * (1 + threshold) and result['p95_ms'] - baseline['p95_ms'] > floor_ms:
+        regressions.append(f"p95 {result['p95_ms']} ms > {baseline['p95_ms']} ms")
+    return regressions
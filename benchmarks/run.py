@@ -0,0 +1,70 @@
+import json, os, platform, sys
+from argparse import ArgumentParser
+from time import perf_counter
+from benchmarks.harness import BenchmarkSkipped, get_benchmarks, measure, combine, compare
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def main(argv : list) -> int:
+    parser = ArgumentParser(prog='python -m benchmarks.run', description='PioneerMavSim hot path benchmarks')
+    parser.add_argument('names', nargs='*', help='benchmarks to run, all by default')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown before a regression is reported')
+    parser.add_argument('--floor-ms', type=float, default=0.05, help='p95 increases smaller than this are never reported')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark, the median of each value is reported')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplies the workload size')
+    parser.add_argument('--update', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--output', default=None, help='write the results as JSON')
+    args = parser.parse_args(argv)
+
+    benchmarks = get_benchmarks()
+    names = args.names or list(benchmarks)
+    for name in names:
+        if name not in benchmarks:
+            print(f'Unknown benchmark {name!r}, available: {", ".join(benchmarks)}', file=sys.stderr)
+            return 2
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {'benchmarks' : {}}
+
+    results = {}
+    failed = False
+    print(f'{"benchmark":<22}{"ops/s":>14}{"p50 ms":>11}{"p95 ms":>11}{"p99 ms":>11}  status')
+    for name in names:
+        start = perf_counter()
+        try:
+            result = combine([measure(benchmarks[name], args.scale) for _ in range(max(args.repeat, 1))])
+        except BenchmarkSkipped as e:
+            print(f'{name:<22}{"":>47}  skipped: {e}')
+            continue
+        result['wall_s'] = round(perf_counter() - start, 3)
+        results[name] = result
+        status = 'new'
+        if name in baseline['benchmarks'] and not args.update:
+            regressions = compare(result, baseline['benchmarks'][name], args.threshold, args.floor_ms)
+            status = 'REGRESSION: ' + '; '.join(regressions) if len(regressions) != 0 else 'ok'
+            failed = failed or len(regressions) != 0
+        print(f"{name:<22}{result['throughput']:>14.1f}{result['p50_ms']:>11.3f}{result['p95_ms']:>11.3f}{result['p99_ms']:>11.3f}  {status}")
+
+    report = {
+        'machine' : {'platform' : platform.platform(), 'python' : platform.python_version(), 'cpus' : os.cpu_count()},
+        'scale' : args.scale,
+        'repeat' : args.repeat,
+        'benchmarks' : results
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.update:
+        baseline['machine'] = report['machine']
+        baseline['scale'] = args.scale
+        baseline['benchmarks'].update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,56 +1,76 @@
-from json import dump
-from ObjectVisualizator.main import SettingsManager
-from pioneersim.settings.settings import SimulationSettings
-from pioneersim.utils import ModelType, get_plugin_classes
-from ObjectVisualizator.main import VisualizationWorld
-from plugins.managers import *
-
-class SimulationSettingManager(SettingsManager):
-    def __init__(self):
-        self.simulation = None
-        self.__raw_data = None
-        self.__path = None
-
-    def load(self, path : str):
-        self.__path = path
-        self.__raw_data = super().load(path)
-        self.simulation = SimulationSettings(self.__raw_data['simulation'])
-        return self.__raw_data
-
-    def __dict__(self):
-        return self.__raw_data
-
-    def update_from_dict(self, data_dict : dict):
-        self.__raw_data = data_dict
-
-    def write(self):
-        with open(self.__path, 'w') as f:
-            dump(self.__raw_data, f)
+from typing import TYPE_CHECKING
+from pioneersim.utils import ModelType, get_plugins
+from pioneersim.simulation.registry import ObjectRegistry
+from pioneersim.simulation.thermal import FireIndex, ThermalRaster
+from pioneersim.simulation import metrics
+
+if TYPE_CHECKING:
+    from ObjectVisualizator.main import VisualizationWorld
 
 class ObjectsManager:
-    def __init__(self, visualization : VisualizationWorld):
+    def __init__(self, visualization : 'VisualizationWorld'):
         super().__init__()
         self.visualization = visualization
-        self.objects = []
+        self.objects = ObjectRegistry()
+        simulation = self.visualization.settings.simulation
+        if simulation.fire_raster:
+            self.objects.thermal = self.__create_raster()
+        else:
+            self.objects.thermal = FireIndex(simulation.fire_radius, simulation.fire_min_temp, simulation.fire_static)
         self.model_managers = {}
+        self.__managers_by_model = {}
         
-        classes = get_plugin_classes('managers', 'ModelManager')
-        for index in range(len(ModelType._member_names_)):
-            model_type = ModelType[ModelType._member_names_[index]]
-            for manager_classes in classes:
-                if str(model_type) == manager_classes.replace('ModelManager', '').lower():
-                    exec(f"self.model_managers[model_type] = {manager_classes}(self.objects, self.visualization)")
+        classes = {name.replace('ModelManager', '').lower() : cls for name, cls in get_plugins('managers').items()}
+        for model_type in ModelType:
+            if str(model_type) in classes:
+                self.model_managers[model_type] = classes[str(model_type)](self.objects, self.visualization)
+                self.__managers_by_model[model_type.model] = self.model_managers[model_type]
+
+        if simulation.metrics_port > 0:
+            try:
+                metrics.serve(simulation.metrics_host, simulation.metrics_port)
+            except OSError as e:
+                print(f'Metrics server on {simulation.metrics_host}:{simulation.metrics_port} failed: {e}')
+        if simulation.metrics_file != '':
+            metrics.export(simulation.metrics_file, simulation.metrics_interval)
 
         self.__run = False
 
+    def __create_raster(self) -> ThermalRaster:
+        simulation = self.visualization.settings.simulation
+        scale = self.visualization.settings.__dict__()['polygon']['scale']
+        return ThermalRaster(
+            scale['x'] * 2,
+            scale['z'] * 2,
+            simulation.fire_resolution,
+            simulation.fire_radius,
+            simulation.fire_min_temp,
+            simulation.fire_max_temp,
+            simulation.fire_static
+        )
+
+    def get_thermal_raster(self) -> ThermalRaster:
+        if isinstance(self.objects.thermal, ThermalRaster):
+            return self.objects.thermal
+        raster = self.__create_raster()
+        for fire in self.objects.by_type(ModelType.FIRE.model):
+            raster.add(fire)
+        return raster
+
     def __get_model_manager_by_type(self, model_type):
-        for key in self.model_managers.keys():
-            if key.model == model_type:
-                return self.model_managers[key]
-        return None
+        return self.__managers_by_model.get(model_type)
 
     def add_object(self, object_type : ModelType, fields : list):
-        self.model_managers[object_type].create_model(fields)  
+        self.model_managers[object_type].create_model(fields)
+
+    def add_objects(self, objects : list) -> int:
+        added = 0
+        for object_type, fields in objects:
+            manager = self.model_managers.get(object_type)
+            if manager is not None:
+                manager.create_model(fields)
+                added += 1
+        return added
 
 
     def remove_objects(self, index : int):
@@ -64,11 +84,18 @@ class ObjectsManager:
         self.model_managers[type].update_model(index, fields)
 
     def get_status_info_by_type(self, model_type : ModelType) -> list:
-        status_data = []
-        for object in self.objects:
-            if type(object) == model_type.model:
-                status_data.append(object.get_status())
-        return status_data
+        manager = self.model_managers.get(model_type)
+        if manager is not None:
+            return manager.get_status()
+        return [object.get_status() for object in self.objects.by_type(model_type.model)]
+
+    def step(self, ticks = 1):
+        for manager in self.model_managers.values():
+            manager.step(ticks)
+
+    def flush(self):
+        for manager in self.model_managers.values():
+            manager.flush()
 
     def start(self):
         if not self.__run:
@@ -1,10 +1,13 @@
 from json import load
 
 class Language:
-    words = load(open('settings/language.json', 'r', encoding='utf-8'))
+    words = None
 
     @classmethod
     def get_word(cls, word : str, language = "rus"):
+        if cls.words is None:
+            with open('settings/language.json', 'r', encoding='utf-8') as f:
+                cls.words = load(f)
         try:
             if language == "rus":
                 return cls.words[word]
@@ -0,0 +1,25 @@
+from json import dump
+from ObjectVisualizator.main import SettingsManager
+from pioneersim.settings.settings import SimulationSettings
+
+class SimulationSettingManager(SettingsManager):
+    def __init__(self):
+        self.simulation = None
+        self.__raw_data = None
+        self.__path = None
+
+    def load(self, path : str):
+        self.__path = path
+        self.__raw_data = super().load(path)
+        self.simulation = SimulationSettings(self.__raw_data['simulation'])
+        return self.__raw_data
+
+    def __dict__(self):
+        return self.__raw_data
+
+    def update_from_dict(self, data_dict : dict):
+        self.__raw_data = data_dict
+
+    def write(self):
+        with open(self.__path, 'w') as f:
+            dump(self.__raw_data, f)
@@ -5,7 +5,30 @@ class SimulationSettings:
         self.battery_capacity = simulation['drone']['battery_capacity']
         self.battery_max = simulation['drone']['battery_max']
         self.battery_off = simulation['drone']['battery_off']
+        self.acceleration = simulation['drone']['acceleration']
+        self.yaw_acceleration = simulation['drone']['yaw_acceleration']
+        self.rate = simulation['engine']['rate']
+        self.time_scale = simulation['engine']['time_scale']
+        self.lockstep = simulation['engine']['lockstep']
+        self.render_fps = simulation['engine']['render_fps']
+        self.shards = simulation['engine']['shards']
+        self.status_rate = simulation['engine']['status_rate']
+        self.state_capacity = simulation['engine']['state_capacity']
+        self.state_name = simulation['engine']['state_name']
+        self.heartbeat_rate = simulation['telemetry']['heartbeat_rate']
+        self.position_rate = simulation['telemetry']['position_rate']
+        self.mission_rate = simulation['telemetry']['mission_rate']
+        self.sensor_rate = simulation['telemetry']['sensor_rate']
+        self.telemetry_delta = simulation['telemetry']['delta']
+        self.telemetry_epsilon = simulation['telemetry']['epsilon']
+        self.telemetry_keepalive = simulation['telemetry']['keepalive']
+        self.metrics_port = simulation['metrics']['http_port']
+        self.metrics_host = simulation['metrics']['http_host']
+        self.metrics_file = simulation['metrics']['export_file']
+        self.metrics_interval = simulation['metrics']['export_interval']
         self.fire_static = simulation['fire']['static']
         self.fire_radius = simulation['fire']['radius']
         self.fire_min_temp = simulation['fire']['min_temp']
-        self.fire_max_temp = simulation['fire']['max_temp']
\ No newline at end of file
+        self.fire_max_temp = simulation['fire']['max_temp']
+        self.fire_raster = simulation['fire']['raster']
+        self.fire_resolution = simulation['fire']['resolution']
\ No newline at end of file
@@ -0,0 +1,43 @@
+import numpy as np
+
+class BatteryIntegrator:
+    IDLE_DRAIN = 0.5
+    ARMED_DRAIN = 1.0
+    HOVER_DRAIN = 1.0
+    MOVE_DRAIN = 1.25
+
+    def __init__(self, capacity = 16):
+        self.charge = np.zeros(capacity)
+        self.maximum = np.ones(capacity)
+        self.voltage = np.zeros(capacity)
+        self.need = np.zeros(capacity, dtype=bool)
+        self.armed = np.zeros(capacity, dtype=bool)
+
+    def grow(self, capacity : int):
+        self.charge = np.concatenate((self.charge, np.zeros(capacity)))
+        self.maximum = np.concatenate((self.maximum, np.ones(capacity)))
+        self.voltage = np.concatenate((self.voltage, np.zeros(capacity)))
+        self.need = np.concatenate((self.need, np.zeros(capacity, dtype=bool)))
+        self.armed = np.concatenate((self.armed, np.zeros(capacity, dtype=bool)))
+
+    def reset(self, slot : int, charge : float, voltage : float, need : bool):
+        self.charge[slot] = charge
+        self.maximum[slot] = charge
+        self.voltage[slot] = voltage
+        self.need[slot] = need
+        self.armed[slot] = False
+
+    def step(self, dt : float, moving : np.ndarray, airborne : np.ndarray):
+        load = np.where(
+            moving,
+            self.MOVE_DRAIN,
+            np.where(airborne, self.HOVER_DRAIN, np.where(self.armed, self.ARMED_DRAIN, self.IDLE_DRAIN))
+        )
+        drain = self.need & (self.charge > 0.0)
+        self.charge[drain] = np.maximum(self.charge[drain] - load[drain] * dt, 0.0)
+
+    def get_voltages(self) -> np.ndarray:
+        return self.charge / self.maximum * self.voltage
+
+    def get_voltage(self, slot : int) -> float:
+        return round(float(self.charge[slot] / self.maximum[slot] * self.voltage[slot]), 1)
@@ -0,0 +1,22 @@
+from threading import Lock
+
+class SimulationClock:
+    def __init__(self, time_scale = 1.0):
+        self.time_scale = time_scale
+        self.__time = 0.0
+        self.__lock = Lock()
+
+    def time(self) -> float:
+        return self.__time
+
+    def time_boot_ms(self) -> int:
+        return int(self.__time * 1000)
+
+    def advance(self, dt : float):
+        with self.__lock:
+            self.__time += dt
+
+    def wall_period(self, dt : float) -> float:
+        if self.time_scale <= 0.0:
+            return 0.0
+        return dt / self.time_scale
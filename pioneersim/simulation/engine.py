@@ -0,0 +1,264 @@
+import numpy as np
+from heapq import heappush, heappop
+from itertools import count
+from threading import Thread, Condition
+from time import perf_counter, sleep
+from pioneersim.simulation.clock import SimulationClock
+from pioneersim.simulation.battery import BatteryIntegrator
+from pioneersim.simulation.signals import Signal
+from pioneersim.simulation.profiles import trapezoid, wrap_angle
+from pioneersim.simulation import metrics
+
+class PhysicsEngine:
+    IDLE = 0
+    MOVE = 1
+    ROTATE = 2
+    VELOCITY = 3
+
+    STEP = 0.01
+
+    def __init__(self, rate = 60, capacity = 16, clock = None, lockstep = False, acceleration = 0.0, yaw_acceleration = 0.0):
+        self.rate = rate
+        self.acceleration = acceleration
+        self.yaw_acceleration = yaw_acceleration
+        self.lockstep = lockstep
+        self.target_time = 0.0
+        if clock is None:
+            clock = SimulationClock()
+        self.clock = clock
+        self.position = np.zeros((capacity, 3))
+        self.yaw = np.zeros(capacity)
+        self.target = np.zeros((capacity, 3))
+        self.target_yaw = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.origin = np.zeros((capacity, 3))
+        self.origin_yaw = np.zeros(capacity)
+        self.start_time = np.zeros(capacity)
+        self.initial_speed = np.zeros(capacity)
+        self.motion = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.yaw_rate = np.zeros(capacity)
+        self.deadline = np.zeros(capacity)
+        self.mode = np.zeros(capacity, dtype=np.int8)
+        self.__used = np.zeros(capacity, dtype=bool)
+        self.battery = BatteryIntegrator(capacity)
+        self.ticked = Signal()
+        self.__listeners = [None] * capacity
+        self.__callbacks = [None] * capacity
+        self.__condition = Condition()
+        self.__thread = None
+        self.__timers = []
+        self.__sequence = count()
+        metrics.engine_rate.set(rate)
+        metrics.engine_drones.track(self, PhysicsEngine.__drones)
+
+    def __grow(self):
+        capacity = len(self.mode)
+        self.position = np.concatenate((self.position, np.zeros((capacity, 3))))
+        self.yaw = np.concatenate((self.yaw, np.zeros(capacity)))
+        self.target = np.concatenate((self.target, np.zeros((capacity, 3))))
+        self.target_yaw = np.concatenate((self.target_yaw, np.zeros(capacity)))
+        self.speed = np.concatenate((self.speed, np.zeros(capacity)))
+        self.origin = np.concatenate((self.origin, np.zeros((capacity, 3))))
+        self.origin_yaw = np.concatenate((self.origin_yaw, np.zeros(capacity)))
+        self.start_time = np.concatenate((self.start_time, np.zeros(capacity)))
+        self.initial_speed = np.concatenate((self.initial_speed, np.zeros(capacity)))
+        self.motion = np.concatenate((self.motion, np.zeros((capacity, 3))))
+        self.velocity = np.concatenate((self.velocity, np.zeros((capacity, 3))))
+        self.yaw_rate = np.concatenate((self.yaw_rate, np.zeros(capacity)))
+        self.deadline = np.concatenate((self.deadline, np.zeros(capacity)))
+        self.mode = np.concatenate((self.mode, np.zeros(capacity, dtype=np.int8)))
+        self.__used = np.concatenate((self.__used, np.zeros(capacity, dtype=bool)))
+        self.battery.grow(capacity)
+        self.__listeners += [None] * capacity
+        self.__callbacks += [None] * capacity
+
+    @property
+    def used(self) -> np.ndarray:
+        return self.__used
+
+    def add(self, x : float, y : float, z : float, yaw : float, speed : float, listener = None) -> int:
+        with self.__condition:
+            free = np.flatnonzero(~self.__used)
+            if len(free) == 0:
+                self.__grow()
+                free = np.flatnonzero(~self.__used)
+            slot = int(free[0])
+            self.__used[slot] = True
+            self.position[slot] = (x, y, z)
+            self.yaw[slot] = yaw
+            self.speed[slot] = speed
+            self.mode[slot] = self.IDLE
+            self.__listeners[slot] = listener
+            self.__callbacks[slot] = None
+            if self.__thread is None and not self.lockstep:
+                self.__thread = Thread(target=self.__loop)
+                self.__thread.daemon = True
+                self.__thread.start()
+            return slot
+
+    def remove(self, slot : int):
+        with self.__condition:
+            self.__used[slot] = False
+            self.battery.need[slot] = False
+            self.mode[slot] = self.IDLE
+            self.__listeners[slot] = None
+            self.__callbacks[slot] = None
+            self.__condition.notify_all()
+
+    def place(self, slot : int, x : float, y : float, z : float):
+        with self.__condition:
+            self.position[slot] = (x, y, z)
+        listener = self.__listeners[slot]
+        if listener is not None:
+            listener()
+
+    def move(self, slot : int, x : float, y : float, z : float, callback = None):
+        with self.__condition:
+            self.target[slot] = (x, y, z)
+            self.origin[slot] = self.position[slot]
+            delta = self.target[slot] - self.origin[slot]
+            distance = np.linalg.norm(delta)
+            self.initial_speed[slot] = max(float(self.motion[slot] @ delta) / distance, 0.0) if distance != 0.0 else 0.0
+            self.start_time[slot] = self.clock.time()
+            self.mode[slot] = self.MOVE
+            self.__callbacks[slot] = callback
+
+    def rotate(self, slot : int, angle : float, callback = None):
+        with self.__condition:
+            self.origin_yaw[slot] = self.yaw[slot]
+            self.target_yaw[slot] = self.yaw[slot] + wrap_angle(angle)
+            self.start_time[slot] = self.clock.time()
+            self.mode[slot] = self.ROTATE
+            self.__callbacks[slot] = callback
+
+    def drive(self, slot : int, vx : float, vy : float, vz : float, yaw_rate : float, timeout : float, callback = None):
+        with self.__condition:
+            self.velocity[slot] = (vx, vy, vz)
+            self.yaw_rate[slot] = yaw_rate
+            self.deadline[slot] = self.clock.time() + timeout
+            self.mode[slot] = self.VELOCITY
+            self.__callbacks[slot] = callback
+
+    def stop(self, slot : int):
+        with self.__condition:
+            self.mode[slot] = self.IDLE
+            self.motion[slot] = 0.0
+            self.__callbacks[slot] = None
+            self.__condition.notify_all()
+
+    def call_later(self, delay : float, callback):
+        timer = [self.clock.time() + delay, next(self.__sequence), callback]
+        with self.__condition:
+            heappush(self.__timers, timer)
+
+    def __run_timers(self):
+        now = self.clock.time()
+        while True:
+            with self.__condition:
+                if len(self.__timers) == 0 or self.__timers[0][0] > now:
+                    return
+                callback = heappop(self.__timers)[2]
+            callback()
+
+    def busy(self, slot : int) -> bool:
+        return self.mode[slot] != self.IDLE
+
+    def advance_to(self, time : float):
+        self.target_time = max(self.target_time, time)
+
+    def pending(self) -> bool:
+        return self.clock.time() < self.target_time
+
+    def step(self, ticks = 1):
+        for _ in range(ticks):
+            self.__tick()
+
+    def __drones(self) -> dict:
+        with self.__condition:
+            return {('used',) : int(self.__used.sum()), ('busy',) : int(np.count_nonzero(self.mode[self.__used] != self.IDLE))}
+
+    def __tick(self):
+        start = perf_counter()
+        listeners = []
+        callbacks = []
+        dt = 1.0 / self.rate
+        now = self.clock.time() + dt
+        with self.__condition:
+            active = np.flatnonzero(self.mode != self.IDLE)
+            self.battery.step(dt, self.mode != self.IDLE, self.position[:, 2] > 0.0)
+            if len(active) != 0:
+                finished = []
+
+                rotate = active[self.mode[active] == self.ROTATE]
+                if len(rotate) != 0:
+                    delta = self.target_yaw[rotate] - self.origin_yaw[rotate]
+                    turned, duration = trapezoid(np.abs(delta), self.speed[rotate], self.yaw_acceleration, now - self.start_time[rotate])
+                    self.yaw[rotate] = self.origin_yaw[rotate] + np.sign(delta) * turned
+                    done = now - self.start_time[rotate] >= duration
+                    self.yaw[rotate[done]] = self.target_yaw[rotate[done]]
+                    finished.append(rotate[done])
+
+                move = active[self.mode[active] == self.MOVE]
+                if len(move) != 0:
+                    delta = self.target[move] - self.origin[move]
+                    distance = np.linalg.norm(delta, axis=1)
+                    travelled, duration = trapezoid(distance, self.speed[move] * self.STEP, self.acceleration, now - self.start_time[move], self.initial_speed[move])
+                    factor = travelled / np.where(distance == 0.0, 1.0, distance)
+                    previous = self.position[move]
+                    self.position[move] = self.origin[move] + delta * factor[:, np.newaxis]
+                    done = now - self.start_time[move] >= duration
+                    self.position[move[done]] = self.target[move[done]]
+                    self.motion[move] = (self.position[move] - previous) / dt
+                    self.motion[move[done]] = 0.0
+                    finished.append(move[done])
+
+                drive = active[self.mode[active] == self.VELOCITY]
+                if len(drive) != 0:
+                    expired = self.deadline[drive] <= now - dt
+                    finished.append(drive[expired])
+                    drive = drive[~expired]
+                    self.yaw[drive] += self.yaw_rate[drive] * dt
+                    angle = np.radians(self.yaw[drive])
+                    velocity = self.velocity[drive]
+                    self.position[drive, 0] += (velocity[:, 0] * np.cos(angle) - velocity[:, 1] * np.sin(angle)) * dt
+                    self.position[drive, 1] += (velocity[:, 0] * np.sin(angle) + velocity[:, 1] * np.cos(angle)) * dt
+                    self.position[drive, 2] = np.maximum(self.position[drive, 2] + velocity[:, 2] * dt, 0.0)
+
+                finished = np.concatenate(finished)
+                self.mode[finished] = self.IDLE
+                self.motion[active[self.mode[active] != self.MOVE]] = 0.0
+                listeners = [self.__listeners[slot] for slot in active]
+                for slot in finished:
+                    if self.__callbacks[slot] is not None:
+                        callbacks.append(self.__callbacks[slot])
+                        self.__callbacks[slot] = None
+                if len(finished) != 0:
+                    self.__condition.notify_all()
+
+        self.clock.advance(dt)
+
+        for listener in listeners:
+            if listener is not None:
+                listener()
+        for callback in callbacks:
+            callback()
+        self.__run_timers()
+        self.ticked.emit()
+        metrics.tick_duration.observe(perf_counter() - start)
+
+    def __loop(self):
+        next_tick = perf_counter()
+        while True:
+            with self.__condition:
+                if not self.__used.any():
+                    self.__thread = None
+                    return
+            self.step()
+            next_tick += self.clock.wall_period(1.0 / self.rate)
+            delay = next_tick - perf_counter()
+            metrics.tick_lag.observe(max(-delay, 0.0))
+            if delay > 0.0:
+                sleep(delay)
+            else:
+                next_tick = perf_counter()
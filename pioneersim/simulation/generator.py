@@ -0,0 +1,127 @@
+import json, socket, sys
+from argparse import ArgumentParser
+from math import ceil, floor, sqrt, cos, sin, pi
+from random import Random
+from pioneersim.utils import ModelType
+from pioneersim.simulation import scenario
+
+LAYOUTS = ('grid', 'circle', 'random')
+
+def port_free(hostname : str, port : int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        try:
+            s.bind((hostname, port))
+        except OSError:
+            return False
+    return True
+
+def allocate_ports(count : int, hostname = 'localhost', start = 8000, reserved = ()) -> list[int]:
+    reserved = set(reserved)
+    ports = []
+    port = start
+    while len(ports) < count:
+        if port > 65535:
+            raise ValueError(f'only {len(ports)} of {count} UDP ports are free on {hostname} from {start}')
+        if port not in reserved and port_free(hostname, port):
+            ports.append(port)
+        port += 1
+    return ports
+
+def grid_layout(count : int, spacing = 1.0, origin = (0.0, 0.0), columns = None) -> list[tuple]:
+    columns = max(ceil(sqrt(count)), 1) if columns is None else columns
+    return [(origin[0] + (index % columns) * spacing, origin[1] + (index // columns) * spacing) for index in range(count)]
+
+def circle_layout(count : int, spacing = 1.0, origin = (0.0, 0.0)) -> list[tuple]:
+    radius = max(count * spacing / (2 * pi), spacing)
+    return [(origin[0] + radius * cos(2 * pi * index / count), origin[1] + radius * sin(2 * pi * index / count)) for index in range(count)]
+
+def random_layout(count : int, bounds : tuple, spacing = 0.0, rng = None) -> list[tuple]:
+    rng = Random() if rng is None else rng
+    x0, y0, x1, y1 = bounds
+    points = []
+    attempts = 0
+    while len(points) < count:
+        point = (rng.uniform(x0, x1), rng.uniform(y0, y1))
+        attempts += 1
+        if attempts < count * 100 and any((point[0] - x) ** 2 + (point[1] - y) ** 2 < spacing ** 2 for x, y in points):
+            continue
+        points.append(point)
+    return points
+
+def layout(name : str, count : int, bounds : tuple, spacing = 1.0, rng = None) -> list[tuple]:
+    x0, y0, x1, y1 = bounds
+    width = x1 - x0
+    height = y1 - y0
+    if name == 'grid':
+        columns = max(ceil(sqrt(count)), 1)
+        if spacing > 0:
+            columns = max(columns, ceil(count / (floor(height / spacing) + 1)))
+            columns = max(min(columns, floor(width / spacing) + 1), 1)
+        rows = ceil(count / columns)
+        if (columns - 1) * spacing > width or (rows - 1) * spacing > height:
+            raise ValueError(f'{count} drones {spacing} m apart do not fit a grid in {width} x {height} m')
+        size_x = (min(columns, count) - 1) * spacing
+        size_y = (rows - 1) * spacing
+        return grid_layout(count, spacing, ((x0 + x1 - size_x) / 2, (y0 + y1 - size_y) / 2), columns)
+    elif name == 'circle':
+        radius = max(count * spacing / (2 * pi), spacing)
+        if 2 * radius > min(width, height):
+            raise ValueError(f'{count} drones {spacing} m apart need a circle {2 * radius:.1f} m wide, bounds are {width} x {height} m')
+        return circle_layout(count, spacing, ((x0 + x1) / 2, (y0 + y1) / 2))
+    elif name == 'random':
+        return random_layout(count, bounds, spacing, rng)
+    raise ValueError(f'unknown layout {name!r}, expected one of {", ".join(LAYOUTS)}')
+
+def generate(drones : int, bounds : tuple, layout_name = 'grid', spacing = 1.0, fires = 0, areas = 0, hostname = 'localhost', port = 8000, seed = None, check_ports = True) -> list[tuple]:
+    rng = Random(seed)
+    if check_ports:
+        ports = allocate_ports(drones, hostname, port)
+    else:
+        ports = list(range(port, port + drones))
+    objects = []
+    for index, (x, y) in enumerate(layout(layout_name, drones, bounds, spacing, rng)):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        objects.append((ModelType.DRONEMAVLINK, [hostname, ports[index], (round(x, 3), round(y, 3), 0.0), color]))
+    x0, y0, x1, y1 = bounds
+    for _ in range(fires):
+        objects.append((ModelType.FIRE, [(round(rng.uniform(x0, x1), 3), round(rng.uniform(y0, y1), 3))]))
+    for _ in range(areas):
+        scale = (round(rng.uniform(0.5, 2.0), 3), round(rng.uniform(0.5, 2.0), 3), round(rng.uniform(0.1, 1.0), 3))
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        objects.append((ModelType.AREA, [(round(rng.uniform(x0, x1), 3), round(rng.uniform(y0, y1), 3)), scale, color]))
+    return objects
+
+def main(argv : list) -> int:
+    parser = ArgumentParser(prog='python -m pioneersim.simulation.generator', description='Generate a PioneerMavSim scenario')
+    parser.add_argument('--drones', type=int, default=100)
+    parser.add_argument('--layout', choices=LAYOUTS, default='grid')
+    parser.add_argument('--spacing', type=float, default=1.0)
+    parser.add_argument('--fires', type=int, default=0)
+    parser.add_argument('--areas', type=int, default=0)
+    parser.add_argument('--hostname', default='localhost')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--no-port-check', action='store_true')
+    parser.add_argument('--bounds', type=float, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'), default=None)
+    parser.add_argument('--settings', default='settings/settings.json')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default='save/save.json')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.bounds is None:
+            with open(args.settings, 'r') as f:
+                scale = json.load(f)['polygon']['scale']
+            args.bounds = (0.0, 0.0, scale['x'] * 2, scale['z'] * 2)
+        objects = generate(
+            args.drones, tuple(args.bounds), args.layout, args.spacing, args.fires, args.areas,
+            args.hostname, args.port, args.seed, not args.no_port_check
+        )
+    except (ValueError, KeyError, OSError) as e:
+        print(f'Scenario generator: {e}', file=sys.stderr)
+        return 1
+    written = scenario.write(args.output, objects)
+    print(f'Scenario generator: {written} objects written to {args.output}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
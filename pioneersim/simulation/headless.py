@@ -0,0 +1,130 @@
+import json, signal, sys
+from argparse import ArgumentParser
+from threading import Event
+from pioneersim.settings.settings import SimulationSettings
+from pioneersim.managers import ObjectsManager
+from pioneersim.utils import ModelType
+from pioneersim.simulation.startup import StartupProfiler
+from pioneersim.simulation import scenario
+
+class HeadlessSettingManager:
+    def __init__(self):
+        self.simulation = None
+        self.__raw_data = None
+
+    def load(self, path : str):
+        with open(path, 'r') as f:
+            self.update_from_dict(json.load(f))
+        return self.__raw_data
+
+    def __dict__(self):
+        return self.__raw_data
+
+    def update_from_dict(self, data_dict : dict):
+        self.__raw_data = data_dict
+        self.simulation = SimulationSettings(data_dict['simulation'])
+
+class HeadlessWorld:
+    headless = True
+
+    def __init__(self, settings : HeadlessSettingManager):
+        self.settings = settings
+        self.__colors = []
+
+    def add_model(self, name : str, position : tuple, yaw : float, trajectory : bool, color = None):
+        self.__colors.append((0, 0, 0))
+
+    def remove_model(self, index : int):
+        self.__colors.pop(index)
+
+    def change_model_position(self, index : int, position : tuple, yaw : float):
+        pass
+
+    def change_model_scale(self, index : int, scale : tuple):
+        pass
+
+    def change_model_color(self, index : int, r = 0, g = 0, b = 0):
+        self.__colors[index] = (r, g, b)
+
+    def get_model_color(self, index : int) -> tuple:
+        return self.__colors[index]
+
+    def change_trajectory_color(self, index : int, r : float, g : float, b : float):
+        pass
+
+    def reset_camera(self):
+        pass
+
+    def reset_trajectories(self):
+        pass
+
+class HeadlessSimulation:
+    def __init__(self, settings_path : str, save_path : str):
+        self.settings = HeadlessSettingManager()
+        self.settings.load(settings_path)
+
+        self.world = HeadlessWorld(self.settings)
+        self.objects_manager = ObjectsManager(self.world)
+        self.load(save_path)
+
+    def load(self, path : str):
+        self.objects_manager.add_objects(scenario.load(path))
+
+    def start(self):
+        self.objects_manager.start()
+
+    def step(self, ticks = 1):
+        self.objects_manager.step(ticks)
+
+    def serve(self, stop : Event):
+        manager = self.objects_manager.model_managers[ModelType.DRONEMAVLINK]
+        while not stop.is_set():
+            manager.serve(0.1)
+
+    def close(self):
+        self.objects_manager.close()
+        if self.settings.simulation.lockstep:
+            self.step(self.settings.simulation.rate)
+
+def main(argv : list, profiler = None) -> int:
+    parser = ArgumentParser(prog='main.py --headless', description='PioneerMavSim without GUI and renderer')
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--settings', default='settings/settings.json')
+    parser.add_argument('--save', default='save/save.json')
+    parser.add_argument('--profile-startup', action='store_true')
+    parser.add_argument('--export-thermal', default=None, metavar='PATH', help='write the fire heat map (.ppm image or .npy array) and exit')
+    args = parser.parse_args(argv)
+    if profiler is None:
+        profiler = StartupProfiler(args.profile_startup)
+
+    with profiler.phase('load scenario'):
+        try:
+            simulation = HeadlessSimulation(args.settings, args.save)
+        except (OSError, scenario.ScenarioError) as e:
+            print(f'PioneerMavSim headless: cannot load scenario: {e}', file=sys.stderr)
+            return 1
+    if args.export_thermal is not None:
+        try:
+            simulation.objects_manager.get_thermal_raster().save(args.export_thermal)
+        except OSError as e:
+            print(f'PioneerMavSim headless: cannot export heat map: {e}', file=sys.stderr)
+            return 1
+        print(f'PioneerMavSim headless: heat map written to {args.export_thermal}')
+        return 0
+    stop = Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    with profiler.phase('start objects'):
+        simulation.start()
+    profiler.report()
+    print(f'PioneerMavSim headless: {len(simulation.objects_manager.objects)} objects online')
+    state = simulation.objects_manager.model_managers[ModelType.DRONEMAVLINK].state
+    if state is not None:
+        print(f'PioneerMavSim headless: state table {state.name}')
+    if simulation.settings.simulation.lockstep:
+        simulation.serve(stop)
+    else:
+        stop.wait()
+    simulation.close()
+    return 0
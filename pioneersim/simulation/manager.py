@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from ObjectVisualizator.main import VisualizationWorld
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ObjectVisualizator.main import VisualizationWorld
 
 class ModelManager(ABC):
 
     @abstractmethod
-    def __init__(self, objects : list,  visualization : VisualizationWorld):
+    def __init__(self, objects : list,  visualization : 'VisualizationWorld'):
         self.objects = objects
         self.visualization = visualization
         self.object_type = None
@@ -28,4 +31,13 @@ class ModelManager(ABC):
 
     @abstractmethod
     def close(self, index : int):
-        pass
\ No newline at end of file
+        pass
+
+    def get_status(self) -> list:
+        return [object.get_status() for object in self.objects.by_type(self.object_type.model)]
+
+    def step(self, ticks : int):
+        pass
+
+    def flush(self):
+        pass
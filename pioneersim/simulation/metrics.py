@@ -0,0 +1,253 @@
+import json, os, threading
+from bisect import bisect_left
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from time import monotonic, sleep, time
+from weakref import WeakKeyDictionary
+
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name : str, help : str, labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.__values = {}
+        self.__lock = threading.Lock()
+
+    def inc(self, value = 1, *labels):
+        with self.__lock:
+            self.__values[labels] = self.__values.get(labels, 0) + value
+
+    def get(self, *labels) -> float:
+        return self.__values.get(labels, 0)
+
+    def collect(self) -> dict:
+        with self.__lock:
+            return dict(self.__values)
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(self, name : str, help : str, labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.__values = {}
+        self.__function = None
+        self.__owners = WeakKeyDictionary()
+        self.__lock = threading.Lock()
+
+    def set(self, value : float, *labels):
+        with self.__lock:
+            self.__values[labels] = value
+
+    def set_function(self, function):
+        self.__function = function
+
+    def track(self, owner, function):
+        with self.__lock:
+            self.__owners[owner] = function
+
+    def get(self, *labels) -> float:
+        return self.collect().get(labels, 0)
+
+    def collect(self) -> dict:
+        with self.__lock:
+            values = dict(self.__values)
+            owners = list(self.__owners.items())
+        if self.__function is not None:
+            values[()] = self.__function()
+        for owner, function in owners:
+            for labels, value in function(owner).items():
+                values[labels] = values.get(labels, 0) + value
+        return values
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name : str, help : str, labels = (), buckets = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.__values = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, value : float, *labels):
+        with self.__lock:
+            series = self.__values.get(labels)
+            if series is None:
+                series = self.__values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def quantile(self, fraction : float, *labels) -> float:
+        with self.__lock:
+            series = self.__values.get(labels)
+            if series is None or series[2] == 0:
+                return 0.0
+            counts = list(series[0])
+            total = series[2]
+        rank = fraction * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def collect(self) -> dict:
+        with self.__lock:
+            return {labels : (list(series[0]), series[1], series[2]) for labels, series in self.__values.items()}
+
+class MetricsRegistry:
+    def __init__(self):
+        self.started = time()
+        self.__metrics = {}
+        self.__lock = threading.Lock()
+
+    def __add(self, metric):
+        with self.__lock:
+            return self.__metrics.setdefault(metric.name, metric)
+
+    def counter(self, name : str, help : str, labels = ()) -> Counter:
+        return self.__add(Counter(name, help, labels))
+
+    def gauge(self, name : str, help : str, labels = ()) -> Gauge:
+        return self.__add(Gauge(name, help, labels))
+
+    def histogram(self, name : str, help : str, labels = (), buckets = LATENCY_BUCKETS) -> Histogram:
+        return self.__add(Histogram(name, help, labels, buckets))
+
+    def get(self, name : str):
+        return self.__metrics.get(name)
+
+    def snapshot(self) -> dict:
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        data = {'timestamp' : time(), 'uptime' : time() - self.started, 'metrics' : {}}
+        for metric in metrics:
+            series = []
+            for labels, value in metric.collect().items():
+                entry = {'labels' : dict(zip(metric.labels, labels))}
+                if metric.kind == 'histogram':
+                    counts, total, count = value
+                    entry['buckets'] = dict(zip([str(bucket) for bucket in metric.buckets] + ['+Inf'], counts))
+                    entry['sum'] = total
+                    entry['count'] = count
+                    entry['p50'] = metric.quantile(0.5, *labels)
+                    entry['p95'] = metric.quantile(0.95, *labels)
+                else:
+                    entry['value'] = value
+                series.append(entry)
+            data['metrics'][metric.name] = {'type' : metric.kind, 'help' : metric.help, 'series' : series}
+        return data
+
+    @staticmethod
+    def __labels_text(names : tuple, values : tuple, extra = '') -> str:
+        pairs = [f'{name}="{str(value)}"' for name, value in zip(names, values)]
+        if extra != '':
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if len(pairs) != 0 else ''
+
+    @staticmethod
+    def __number(value : float) -> str:
+        if value == float('inf'):
+            return '+Inf'
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    def prometheus(self) -> str:
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for labels, value in sorted(metric.collect().items()):
+                if metric.kind == 'histogram':
+                    counts, total, count = value
+                    cumulative = 0
+                    for bucket, bucket_count in zip(metric.buckets + (float('inf'),), counts):
+                        cumulative += bucket_count
+                        le = f'le="{self.__number(bucket)}"'
+                        lines.append(f'{metric.name}_bucket{self.__labels_text(metric.labels, labels, le)} {cumulative}')
+                    lines.append(f'{metric.name}_sum{self.__labels_text(metric.labels, labels)} {self.__number(total)}')
+                    lines.append(f'{metric.name}_count{self.__labels_text(metric.labels, labels)} {count}')
+                else:
+                    lines.append(f'{metric.name}{self.__labels_text(metric.labels, labels)} {self.__number(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path : str):
+        text = json.dumps(self.snapshot()) if path.endswith('.json') else self.prometheus()
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+registry = MetricsRegistry()
+
+messages_received = registry.counter('pioneersim_messages_received_total', 'MAVLink messages received by the simulator', ('type',))
+messages_sent = registry.counter('pioneersim_messages_sent_total', 'MAVLink messages sent by the simulator', ('type',))
+handler_latency = registry.histogram('pioneersim_handler_seconds', 'Time spent handling a received MAVLink message', ('type',))
+handler_errors = registry.counter('pioneersim_handler_errors_total', 'Received MAVLink messages that took a drone offline', ('type',))
+tick_duration = registry.histogram('pioneersim_engine_tick_seconds', 'Wall time of one physics tick including listeners')
+tick_lag = registry.histogram('pioneersim_engine_tick_lag_seconds', 'How far a physics tick overran its slot at the target rate')
+engine_rate = registry.gauge('pioneersim_engine_target_rate_hz', 'Target physics tick rate')
+engine_drones = registry.gauge('pioneersim_engine_drones', 'Drones in the physics engine', ('state',))
+socket_backlog = registry.gauge('pioneersim_socket_backlog_bytes', 'Bytes waiting in drone socket receive buffers', ('stat',))
+socket_drops = registry.gauge('pioneersim_socket_drops', 'Datagrams dropped by full drone socket receive buffers since they were opened')
+threads = registry.gauge('pioneersim_threads', 'Live Python threads')
+threads.set_function(threading.active_count)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in ('/metrics', '/'):
+            body = registry.prometheus().encode()
+            content_type = 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body = json.dumps(registry.snapshot()).encode()
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+__server = None
+__writer = None
+
+def serve(host = '127.0.0.1', port = 9464) -> ThreadingHTTPServer:
+    global __server
+    if __server is None:
+        __server = ThreadingHTTPServer((host, port), MetricsHandler)
+        __server.daemon_threads = True
+        thread = threading.Thread(target=__server.serve_forever, name='metrics-http')
+        thread.daemon = True
+        thread.start()
+    return __server
+
+def export(path : str, interval = 5.0):
+    global __writer
+    if __writer is None:
+        def loop():
+            next_write = monotonic()
+            while True:
+                try:
+                    registry.write(path)
+                except OSError as e:
+                    print(f'Metrics export to {path} failed: {e}')
+                next_write += interval
+                sleep(max(next_write - monotonic(), 0.0))
+        __writer = threading.Thread(target=loop, name='metrics-file')
+        __writer.daemon = True
+        __writer.start()
+    return __writer
@@ -0,0 +1,76 @@
+from collections import deque
+from math import dist
+from threading import RLock
+from pioneersim.simulation.signals import Signal
+
+class MotionController:
+    def __init__(self, engine, slot : int):
+        self.__engine = engine
+        self.__slot = slot
+        self.__queue = deque()
+        self.__lock = RLock()
+        self.__generation = 0
+        self.current = None
+        self.origin = None
+        self.reached = 0
+        self.waypoint_reached = Signal()
+        self.finished = Signal()
+
+    def __len__(self) -> int:
+        return len(self.__queue) + (self.current is not None)
+
+    def __next(self) -> bool:
+        self.__generation += 1
+        if len(self.__queue) == 0:
+            self.current = None
+            return False
+        self.current = self.__queue.popleft()
+        self.origin = tuple(self.__engine.position[self.__slot])
+        generation = self.__generation
+        if self.current[3] == 0.0:
+            self.__rotated(generation)
+        else:
+            self.__engine.rotate(self.__slot, self.current[3], lambda: self.__rotated(generation))
+        return True
+
+    def __rotated(self, generation : int):
+        with self.__lock:
+            if generation == self.__generation:
+                self.__engine.move(self.__slot, *self.current[0:3], lambda: self.__arrived(generation))
+
+    def __arrived(self, generation : int):
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            self.reached += 1
+            busy = self.__next()
+        self.waypoint_reached.emit(self.reached)
+        if not busy:
+            self.finished.emit()
+
+    def set_target(self, x : float, y : float, z : float, yaw = 0.0):
+        with self.__lock:
+            self.__queue.clear()
+            self.__queue.append((x, y, z, yaw))
+            self.__next()
+
+    def enqueue(self, x : float, y : float, z : float, yaw = 0.0):
+        with self.__lock:
+            self.__queue.append((x, y, z, yaw))
+            if self.current is None:
+                self.__next()
+
+    def cancel(self):
+        with self.__lock:
+            self.__queue.clear()
+            self.__next()
+        self.__engine.stop(self.__slot)
+
+    def progress(self) -> float:
+        current = self.current
+        if current is None:
+            return 1.0
+        total = dist(self.origin, current[0:3])
+        if total == 0.0:
+            return 1.0
+        return max(0.0, 1.0 - dist(self.__engine.position[self.__slot], current[0:3]) / total)
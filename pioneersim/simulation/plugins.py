@@ -1,16 +1,100 @@
-import inspect, sys
-
-def get_plugin_classes(plugin_type, base_class_filter=None):
-    classes = [cls_name for cls_name, cls_obj in inspect.getmembers(sys.modules[f'plugins.{plugin_type}']) if inspect.isclass(cls_obj)]
-    if base_class_filter is not None:
-        exec(f"from plugins.{plugin_type} import *")
-        filter_classes = []
-        base_classes = []
+import ast, json, os, sys, traceback
+from importlib import import_module
+from importlib.metadata import entry_points
+
+PLUGINS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'plugins')
+MANIFEST_PATH = os.path.join(PLUGINS_PATH, '__pycache__', 'manifest.json')
+
+__registry = {}
+__manifest = None
+__entry_points = {}
+
+def register(plugin_type : str):
+    def decorator(cls):
+        __registry.setdefault(plugin_type, {})[cls.__name__] = cls
+        return cls
+    return decorator
+
+def __scan(path : str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    classes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Call) and getattr(decorator.func, 'id', None) == 'register':
+                    classes.append(node.name)
+    return classes
+
+def __sources() -> dict:
+    sources = {}
+    for plugin_type in sorted(os.listdir(PLUGINS_PATH)):
+        directory = os.path.join(PLUGINS_PATH, plugin_type)
+        if not os.path.isfile(os.path.join(directory, '__init__.py')):
+            continue
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith('.py') and file_name != '__init__.py':
+                stat = os.stat(os.path.join(directory, file_name))
+                sources[f'{plugin_type}/{file_name}'] = [stat.st_mtime_ns, stat.st_size]
+    return sources
+
+def discover() -> dict:
+    global __manifest
+    if __manifest is not None:
+        return __manifest
+    sources = __sources()
+    try:
+        with open(MANIFEST_PATH, 'r') as f:
+            manifest = json.load(f)
+        if manifest['sources'] == sources:
+            __manifest = manifest
+            return __manifest
+    except (OSError, ValueError, KeyError):
+        pass
+    manifest = {'sources' : sources, 'plugins' : {}}
+    for source in sources:
+        plugin_type, file_name = source.split('/')
+        module = f'plugins.{plugin_type}.{file_name[:-3]}'
+        try:
+            classes = __scan(os.path.join(PLUGINS_PATH, plugin_type, file_name))
+        except (OSError, SyntaxError) as e:
+            print(f'Plugin {module} skipped: {e}', file=sys.stderr)
+            continue
         for class_name in classes:
-            exec(f"base_classes.append({class_name}.__bases__[0].__name__)")
-        for index in range(len(base_classes)):
-            if base_classes[index] == base_class_filter:
-                filter_classes.append(classes[index])
-        return filter_classes
-    else:
-        return classes
\ No newline at end of file
+            manifest['plugins'].setdefault(plugin_type, {})[class_name] = module
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        with open(MANIFEST_PATH, 'w') as f:
+            json.dump(manifest, f)
+    except OSError:
+        pass
+    __manifest = manifest
+    return __manifest
+
+def __group(plugin_type : str) -> list:
+    group = f'pioneersim.{plugin_type}'
+    if group not in __entry_points:
+        installed = entry_points()
+        if hasattr(installed, 'select'):
+            __entry_points[group] = list(installed.select(group=group))
+        else:
+            __entry_points[group] = list(installed.get(group, []))
+    return __entry_points[group]
+
+def get_plugins(plugin_type : str) -> dict:
+    for class_name, module in discover()['plugins'].get(plugin_type, {}).items():
+        if class_name not in __registry.get(plugin_type, {}):
+            try:
+                import_module(module)
+            except Exception:
+                print(f'Plugin {module} failed to load:', file=sys.stderr)
+                traceback.print_exc()
+    plugins = dict(__registry.get(plugin_type, {}))
+    for entry_point in __group(plugin_type):
+        try:
+            cls = entry_point.load()
+            plugins.setdefault(cls.__name__, cls)
+        except Exception:
+            print(f'Plugin {entry_point.value} failed to load:', file=sys.stderr)
+            traceback.print_exc()
+    return {name : plugins[name] for name in sorted(plugins)}
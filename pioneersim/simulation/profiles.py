@@ -0,0 +1,34 @@
+import numpy as np
+
+def wrap_angle(angle):
+    return (np.asarray(angle) + 180.0) % 360.0 - 180.0
+
+def trapezoid(distance, speed, acceleration, elapsed, initial = 0.0):
+    distance = np.asarray(distance, dtype=float)
+    speed = np.maximum(np.asarray(speed, dtype=float), 1e-9)
+    elapsed = np.maximum(np.asarray(elapsed, dtype=float), 0.0)
+    if acceleration <= 0.0:
+        return np.minimum(speed * elapsed, distance), distance / speed
+    initial = np.minimum(np.asarray(initial, dtype=float), speed)
+    peak = np.minimum(speed, np.sqrt(acceleration * distance + initial ** 2 / 2.0))
+    overshoot = peak < initial
+    peak = np.where(overshoot, initial, peak)
+    braking = np.where(overshoot, initial ** 2 / np.maximum(2.0 * distance, 1e-9), acceleration)
+    braking = np.maximum(braking, 1e-9)
+    ramp = (peak - initial) / acceleration
+    ramp_distance = (peak ** 2 - initial ** 2) / (2.0 * acceleration)
+    stop = peak / braking
+    stop_distance = peak ** 2 / (2.0 * braking)
+    cruise = np.maximum(distance - ramp_distance - stop_distance, 0.0) / np.maximum(peak, 1e-9)
+    duration = ramp + cruise + stop
+    remaining = np.maximum(duration - elapsed, 0.0)
+    travelled = np.where(
+        elapsed < ramp,
+        initial * elapsed + 0.5 * acceleration * elapsed ** 2,
+        np.where(
+            remaining > stop,
+            ramp_distance + peak * (elapsed - ramp),
+            distance - 0.5 * braking * remaining ** 2
+        )
+    )
+    return np.clip(travelled, 0.0, distance), duration
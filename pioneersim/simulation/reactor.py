@@ -0,0 +1,157 @@
+import socket
+import selectors
+from collections import deque
+from threading import Thread, Lock
+from time import perf_counter
+from pioneersim.simulation.startup import lazy_import
+from pioneersim.simulation import metrics
+
+common = lazy_import('pymavlink.dialects.v20.common')
+
+class MavlinkEndpoint:
+    def __init__(self, reactor, hostname : str, port : int, handler, source_system = 255, source_component = 26):
+        self.reactor = reactor
+        self.handler = handler
+        self.port = port
+        self.address = None
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((hostname, port))
+        self.socket.setblocking(False)
+        self.mav = common.MAVLink(self, source_system, source_component)
+        self.mav.robust_parsing = True
+
+    def write(self, buf : bytes):
+        if self.address is not None:
+            try:
+                self.socket.sendto(buf, self.address)
+            except OSError:
+                return
+            message = common.mavlink_map.get(buf[7] | buf[8] << 8 | buf[9] << 16 if buf[0] == 0xFD else buf[5])
+            metrics.messages_sent.inc(1, message.msgname if message is not None else 'UNKNOWN')
+
+    def read(self) -> list:
+        messages = []
+        while True:
+            try:
+                data, self.address = self.socket.recvfrom(65535)
+            except OSError:
+                return messages
+            parsed = self.mav.parse_buffer(data)
+            if parsed is not None:
+                for msg in parsed:
+                    metrics.messages_received.inc(1, msg.get_type())
+                messages += parsed
+
+    def close(self):
+        self.reactor.unregister(self)
+
+class MavlinkReactor:
+    def __init__(self, lockstep = False):
+        self.lockstep = lockstep
+        self.__selector = selectors.DefaultSelector()
+        self.__lock = Lock()
+        self.__callbacks = deque()
+        self.__endpoints = 0
+        self.__thread = None
+        self.__wakeup_reader, self.__wakeup_writer = socket.socketpair()
+        self.__wakeup_reader.setblocking(False)
+        self.__wakeup_writer.setblocking(False)
+        self.__selector.register(self.__wakeup_reader, selectors.EVENT_READ)
+        self.__ports = set()
+        metrics.socket_backlog.track(self, MavlinkReactor.__backlog)
+        metrics.socket_drops.track(self, MavlinkReactor.__drops)
+
+    def __queues(self) -> list[tuple]:
+        with self.__lock:
+            ports = set(self.__ports)
+        queues = []
+        for table in ('/proc/net/udp', '/proc/net/udp6'):
+            try:
+                with open(table, 'r') as f:
+                    lines = f.readlines()[1:]
+            except OSError:
+                continue
+            for line in lines:
+                fields = line.split()
+                if int(fields[1].rsplit(':', 1)[1], 16) in ports:
+                    queues.append((int(fields[4].split(':')[1], 16), int(fields[-1])))
+        return queues
+
+    def __backlog(self) -> dict:
+        queued = [queue for queue, _ in self.__queues()]
+        return {('total',) : sum(queued), ('max',) : max(queued, default=0)}
+
+    def __drops(self) -> dict:
+        return {() : sum(drops for _, drops in self.__queues())}
+
+    def open(self, hostname : str, port : int, handler) -> MavlinkEndpoint:
+        endpoint = MavlinkEndpoint(self, hostname, port, handler)
+        with self.__lock:
+            self.__endpoints += 1
+            self.__ports.add(port)
+        self.call_soon(lambda: self.__selector.register(endpoint.socket, selectors.EVENT_READ, endpoint))
+        return endpoint
+
+    def unregister(self, endpoint : MavlinkEndpoint):
+        def remove():
+            self.__selector.unregister(endpoint.socket)
+            endpoint.socket.close()
+            with self.__lock:
+                self.__endpoints -= 1
+                self.__ports.discard(endpoint.port)
+        self.call_soon(remove)
+
+    def call_soon(self, callback):
+        with self.__lock:
+            wakeup = len(self.__callbacks) == 0
+            self.__callbacks.append(callback)
+            if self.__thread is None and not self.lockstep:
+                self.__thread = Thread(target=self.__loop)
+                self.__thread.daemon = True
+                self.__thread.start()
+        if wakeup:
+            try:
+                self.__wakeup_writer.send(b'\0')
+            except BlockingIOError:
+                pass
+
+    def poll(self, timeout = 0.0):
+        self.__run_callbacks()
+        self.__dispatch(self.__selector.select(timeout))
+        self.__run_callbacks()
+
+    def __run_callbacks(self) -> bool:
+        while True:
+            with self.__lock:
+                if len(self.__callbacks) == 0:
+                    if self.__endpoints == 0 and not self.lockstep:
+                        self.__thread = None
+                        return False
+                    return True
+                callback = self.__callbacks.popleft()
+            callback()
+
+    def __loop(self):
+        while self.__run_callbacks():
+            self.__dispatch(self.__selector.select())
+
+    def __dispatch(self, events : list):
+        endpoints = []
+        for key, _ in events:
+            if key.data is None:
+                try:
+                    self.__wakeup_reader.recv(4096)
+                except BlockingIOError:
+                    pass
+            else:
+                endpoints.append(key.data)
+        endpoints.sort(key=lambda endpoint: endpoint.port)
+        for endpoint in endpoints:
+            for msg in endpoint.read():
+                start = perf_counter()
+                endpoint.handler(msg)
+                kind = msg.get_type()
+                if kind == 'COMMAND_LONG':
+                    kind = f'COMMAND_LONG:{msg.command}'
+                metrics.handler_latency.observe(perf_counter() - start, kind)
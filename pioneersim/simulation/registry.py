@@ -0,0 +1,70 @@
+from itertools import count
+
+class ObjectRegistry:
+    def __init__(self):
+        self.__objects = {}
+        self.__order = []
+        self.__indexes = {}
+        self.__types = {}
+        self.__keys = {}
+        self.__bound = {}
+        self.__sequence = count(1)
+        self.thermal = None
+
+    def __len__(self) -> int:
+        return len(self.__order)
+
+    def __iter__(self):
+        return (self.__objects[handle] for handle in self.__order)
+
+    def __getitem__(self, index : int):
+        return self.__objects[self.__order[index]]
+
+    def append(self, obj) -> int:
+        handle = next(self.__sequence)
+        self.__objects[handle] = obj
+        self.__indexes[handle] = len(self.__order)
+        self.__order.append(handle)
+        self.__types.setdefault(type(obj), {})[handle] = None
+        return handle
+
+    def pop(self, index : int):
+        if index < 0:
+            index += len(self.__order)
+        handle = self.__order.pop(index)
+        for position in range(index, len(self.__order)):
+            self.__indexes[self.__order[position]] = position
+        del self.__indexes[handle]
+        obj = self.__objects.pop(handle)
+        del self.__types[type(obj)][handle]
+        self.unbind(self.__bound.pop(handle, None))
+        return obj
+
+    def handle(self, index : int) -> int:
+        return self.__order[index]
+
+    def index(self, handle : int) -> int:
+        return self.__indexes.get(handle, -1)
+
+    def get(self, handle : int):
+        return self.__objects.get(handle)
+
+    def by_type(self, model_class) -> list:
+        return [self.__objects[handle] for handle in self.__types.get(model_class, {})]
+
+    def count(self, model_class) -> int:
+        return len(self.__types.get(model_class, {}))
+
+    def bind(self, key, handle : int):
+        self.unbind(self.__bound.get(handle))
+        self.__keys[key] = handle
+        self.__bound[handle] = key
+
+    def unbind(self, key):
+        if key is not None:
+            handle = self.__keys.pop(key, None)
+            if handle is not None:
+                self.__bound.pop(handle, None)
+
+    def handle_of(self, key) -> int:
+        return self.__keys.get(key, -1)
@@ -0,0 +1,33 @@
+from threading import Lock
+from time import perf_counter
+from pioneersim.simulation.signals import Signal
+
+class RenderSync:
+    def __init__(self, fps = 30):
+        self.fps = fps
+        self.frame = Signal()
+        self.__positions = set()
+        self.__colors = set()
+        self.__lock = Lock()
+        self.__next_frame = 0.0
+
+    def mark_position(self, item):
+        with self.__lock:
+            self.__positions.add(item)
+
+    def mark_color(self, item):
+        with self.__lock:
+            self.__colors.add(item)
+
+    def update(self):
+        now = perf_counter()
+        if now >= self.__next_frame:
+            self.__next_frame = now + 1.0 / self.fps
+            self.flush()
+
+    def flush(self):
+        with self.__lock:
+            positions, self.__positions = self.__positions, set()
+            colors, self.__colors = self.__colors, set()
+        if len(positions) != 0 or len(colors) != 0:
+            self.frame.emit(positions, colors)
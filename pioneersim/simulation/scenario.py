@@ -0,0 +1,81 @@
+import json, os
+from pioneersim.utils import ModelType
+
+FORMAT = 'pioneersim-scenario'
+VERSION = 2
+
+class ScenarioError(ValueError):
+    def __init__(self, path : str, line : int, reason : str):
+        super().__init__(f'{path}:{line}: {reason}')
+        self.path = path
+        self.line = line
+        self.reason = reason
+
+def __unpack(path : str, line : int, record) -> tuple:
+    try:
+        model_type = ModelType.get_type_from_name(record['type'])
+        if model_type is None:
+            raise ScenarioError(path, line, f'unknown object type {record["type"]!r}')
+        return model_type, model_type.model.unpack(record)
+    except (KeyError, TypeError, IndexError) as e:
+        raise ScenarioError(path, line, f'malformed object ({type(e).__name__}: {e})') from e
+
+def __read_legacy(path : str, f):
+    try:
+        records = json.load(f)
+    except ValueError as e:
+        raise ScenarioError(path, 1, str(e)) from e
+    if not isinstance(records, list):
+        raise ScenarioError(path, 1, 'expected a list of objects')
+    for index, record in enumerate(records):
+        yield __unpack(path, index + 1, record)
+
+def __read_lines(path : str, f):
+    header = None
+    for line, text in enumerate(f, 1):
+        if text.strip() == '':
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            raise ScenarioError(path, line, str(e)) from e
+        if header is None:
+            header = record
+            if not isinstance(header, dict) or header.get('format') != FORMAT:
+                raise ScenarioError(path, line, 'missing scenario header')
+            if not isinstance(header.get('version'), int) or header['version'] > VERSION:
+                raise ScenarioError(path, line, f'unsupported scenario version {header.get("version")!r}')
+            continue
+        yield __unpack(path, line, record)
+
+def read(path : str):
+    with open(path, 'r', encoding='utf-8') as f:
+        start = f.read(1)
+        while start.isspace():
+            start = f.read(1)
+        if start == '':
+            return
+        f.seek(0)
+        if start == '[':
+            yield from __read_legacy(path, f)
+        else:
+            yield from __read_lines(path, f)
+
+def load(path : str) -> list:
+    return list(read(path))
+
+def write(path : str, objects) -> int:
+    directory = os.path.dirname(path)
+    if directory != '':
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f'{path}.tmp'
+    written = 0
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'format' : FORMAT, 'version' : VERSION}) + '\n')
+        for type, fields in objects:
+            record = {'type' : str(type)}
+            record.update(type.model.pack(fields))
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            written += 1
+    os.replace(temp_path, path)
+    return written
@@ -0,0 +1,253 @@
+from copy import deepcopy
+from itertools import count
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from threading import Thread, Lock
+from time import perf_counter
+from pioneersim.simulation.signals import Signal
+
+class ShardState:
+    def __init__(self, pool : 'ShardPool', id : int, position : tuple):
+        self.change_position = Signal()
+        self.change_color = Signal()
+        self.offline = Signal()
+        self.online = True
+        self.id = id
+        self.x, self.y, self.z = position
+        self.yaw = 0.0
+        self.speed = 0
+        self.color = (0, 0, 0)
+        self.preflight_status = False
+        self.takeoff_status = False
+        self.inprogress = False
+        self.__pool = pool
+        self.__battery = 0.0
+        self.__temp = 20.0
+
+    def update(self, x : float, y : float, z : float, yaw : float, color : tuple, preflight_status : bool, takeoff_status : bool, battery : float):
+        moved = (x, y, z, yaw) != (self.x, self.y, self.z, self.yaw)
+        self.x, self.y, self.z, self.yaw = x, y, z, yaw
+        self.preflight_status = preflight_status
+        self.takeoff_status = takeoff_status
+        self.__battery = battery
+        if moved:
+            self.change_position.emit()
+        if color != self.color:
+            self.color = color
+            self.change_color.emit()
+
+    def get_temp(self) -> float:
+        return self.__temp
+
+    def set_temp(self, temp : float):
+        if temp != self.__temp:
+            self.__temp = temp
+            self.__pool.set_temp(self.id, temp)
+
+    def get_battery(self) -> float:
+        return self.__battery
+
+    def stop(self):
+        self.__pool.close(self.id)
+
+class ShardPool:
+    def __init__(self, settings : dict, workers : int):
+        self.received = Signal()
+        self.workers = workers
+        self.__settings = settings
+        self.__connections = []
+        self.__processes = []
+        self.__locks = []
+        self.__temps = []
+        self.__load = []
+        self.__states = {}
+        self.__sequence = count(1)
+        self.__alive = []
+        self.__lock = Lock()
+        self.__thread = None
+        self.__stopping = False
+
+    def __spawn(self):
+        context = get_context('spawn')
+        for _ in range(self.workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=run_worker, args=(child, self.__settings))
+            process.daemon = True
+            process.start()
+            child.close()
+            self.__connections.append(parent)
+            self.__processes.append(process)
+            self.__locks.append(Lock())
+            self.__temps.append({})
+            self.__load.append(0)
+            self.__alive.append(True)
+        self.__thread = Thread(target=self.__loop)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __send(self, worker : int, message : tuple):
+        with self.__locks[worker]:
+            try:
+                self.__connections[worker].send(message)
+            except (OSError, ValueError):
+                pass
+
+    def start(self, hostname : str, port : int, position : tuple) -> ShardState:
+        with self.__lock:
+            if self.__thread is None:
+                self.__spawn()
+            id = next(self.__sequence)
+            state = ShardState(self, id, position)
+            workers = [worker for worker in range(self.workers) if self.__alive[worker]]
+            if len(workers) == 0:
+                print(f'{hostname}:{port} offline: no shard workers are running')
+                state.online = False
+                return state
+            worker = min(workers, key=self.__load.__getitem__)
+            self.__load[worker] += 1
+            self.__states[id] = (worker, state)
+        self.__send(worker, ('start', id, [hostname, port, position, (0, 0, 0)]))
+        return state
+
+    def close(self, id : int):
+        entry = self.__states.get(id)
+        if entry is not None:
+            self.__send(entry[0], ('close', id))
+
+    def set_temp(self, id : int, temp : float):
+        entry = self.__states.get(id)
+        if entry is not None:
+            self.__temps[entry[0]][id] = temp
+
+    def shutdown(self):
+        with self.__lock:
+            if self.__thread is None:
+                return
+            self.__stopping = True
+        for worker in range(len(self.__connections)):
+            self.__send(worker, ('stop',))
+        for process in self.__processes:
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+        self.__thread.join(1.0)
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections = []
+            self.__processes = []
+            self.__locks = []
+            self.__temps = []
+            self.__load = []
+            self.__alive = []
+            self.__thread = None
+            self.__stopping = False
+
+    def __worker_lost(self, worker : int):
+        process = self.__processes[worker]
+        process.join(0.1)
+        with self.__lock:
+            self.__alive[worker] = False
+            self.__load[worker] = 0
+            lost = [id for id, entry in self.__states.items() if entry[0] == worker]
+            states = [self.__states.pop(id)[1] for id in lost]
+            stopping = self.__stopping
+        if not stopping:
+            print(f'Shard worker {worker} exited with code {process.exitcode}, {len(states)} drones offline')
+        for state in states:
+            state.online = False
+            state.offline.emit()
+
+    def __loop(self):
+        connections = list(self.__connections)
+        workers = {connection : worker for worker, connection in enumerate(connections)}
+        while len(connections) != 0:
+            for connection in wait(connections):
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    connections.remove(connection)
+                    self.__worker_lost(workers[connection])
+                    continue
+                offline = []
+                for id, online, *state in message[1]:
+                    entry = self.__states.get(id)
+                    if entry is None:
+                        continue
+                    entry[1].update(*state)
+                    if not online:
+                        offline.append(id)
+                for id in offline:
+                    with self.__lock:
+                        worker, state = self.__states.pop(id)
+                        self.__load[worker] -= 1
+                    state.online = False
+                    state.offline.emit()
+            self.received.emit()
+            for worker in range(len(self.__temps)):
+                if len(self.__temps[worker]) != 0:
+                    temps, self.__temps[worker] = self.__temps[worker], {}
+                    self.__send(worker, ('temp', list(temps.items())))
+
+def run_worker(connection, settings : dict):
+    from pioneersim.simulation.headless import HeadlessSettingManager, HeadlessWorld
+    from pioneersim.simulation.registry import ObjectRegistry
+    from pioneersim.simulation.thermal import FireIndex
+    from plugins.managers.drone_manager import DroneModelManager
+
+    settings = deepcopy(settings)
+    settings['simulation']['engine']['shards'] = 0
+    settings['simulation']['engine']['state_capacity'] = 0
+    setting_manager = HeadlessSettingManager()
+    setting_manager.update_from_dict(settings)
+    simulation = setting_manager.simulation
+
+    objects = ObjectRegistry()
+    objects.thermal = FireIndex(simulation.fire_radius, simulation.fire_min_temp, simulation.fire_static)
+    world = HeadlessWorld(setting_manager)
+    manager = DroneModelManager(objects, world)
+    manager.run = True
+    drones = {}
+    period = 1 / simulation.render_fps
+    next_report = perf_counter() + period
+    while True:
+        try:
+            ready = connection.poll(max(next_report - perf_counter(), 0.0))
+            message = connection.recv() if ready else None
+        except (EOFError, OSError):
+            message = ('stop',)
+        if message is not None:
+            if message[0] == 'start':
+                manager.create_model(message[2])
+                drones[message[1]] = objects[-1]
+                manager.start(len(objects) - 1)
+            elif message[0] == 'close':
+                if message[1] in drones:
+                    drones[message[1]].online = False
+            elif message[0] == 'temp':
+                for id, temp in message[1]:
+                    if id in drones:
+                        drones[id].set_temp(temp)
+            elif message[0] == 'stop':
+                for drone in drones.values():
+                    drone.online = False
+                return
+        if perf_counter() >= next_report:
+            states = []
+            for id, drone in list(drones.items()):
+                model = drone.model
+                states.append((
+                    id, drone.online, model.x, model.y, model.z, model.yaw, model.color,
+                    model.preflight_status, model.takeoff_status, model.get_battery()
+                ))
+                if not drone.online:
+                    del drones[id]
+                    index = objects.index(objects.handle_of(model))
+                    if index != -1:
+                        objects.pop(index)
+                        world.remove_model(index)
+            try:
+                connection.send(('state', states))
+            except (EOFError, OSError):
+                return
+            next_report = perf_counter() + period
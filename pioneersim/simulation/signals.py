@@ -0,0 +1,21 @@
+from threading import Lock
+
+class Signal:
+    def __init__(self):
+        self.__slots = []
+        self.__lock = Lock()
+
+    def connect(self, slot):
+        with self.__lock:
+            self.__slots = self.__slots + [slot]
+
+    def disconnect(self, slot = None):
+        with self.__lock:
+            if slot is None:
+                self.__slots = []
+            else:
+                self.__slots = [connected for connected in self.__slots if connected != slot]
+
+    def emit(self, *args):
+        for slot in self.__slots:
+            slot(*args)
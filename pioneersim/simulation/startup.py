@@ -0,0 +1,62 @@
+import builtins, sys
+from contextlib import contextmanager
+from importlib.util import find_spec, module_from_spec, LazyLoader
+from time import perf_counter
+
+def lazy_import(name : str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = find_spec(name)
+    loader = LazyLoader(spec.loader)
+    spec.loader = loader
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+class StartupProfiler:
+    def __init__(self, enabled = False, limit = 20):
+        self.enabled = enabled
+        self.limit = limit
+        self.phases = []
+        self.imports = []
+        self.__start = perf_counter()
+        self.__depth = 0
+        self.__import = None
+        if enabled:
+            self.__import = builtins.__import__
+            builtins.__import__ = self.__timed_import
+
+    def __timed_import(self, name, globals = None, locals = None, fromlist = (), level = 0):
+        loaded = len(sys.modules)
+        start = perf_counter()
+        self.__depth += 1
+        try:
+            return self.__import(name, globals, locals, fromlist, level)
+        finally:
+            self.__depth -= 1
+            if len(sys.modules) != loaded:
+                if level > 0 and globals is not None:
+                    name = f"{globals.get('__package__')}.{name}".rstrip('.')
+                self.imports.append((perf_counter() - start, self.__depth, name))
+
+    @contextmanager
+    def phase(self, name : str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, perf_counter() - start))
+
+    def report(self, file = sys.stderr):
+        if not self.enabled:
+            return
+        builtins.__import__ = self.__import
+        self.enabled = False
+        print('Startup profile (ms):', file=file)
+        for name, elapsed in self.phases:
+            print(f'  {elapsed * 1000:9.1f}  {name}', file=file)
+        print(f'  {(perf_counter() - self.__start) * 1000:9.1f}  total', file=file)
+        print(f'Slowest imports (ms, cumulative):', file=file)
+        for elapsed, depth, name in sorted(self.imports, reverse=True)[:self.limit]:
+            print(f'  {elapsed * 1000:9.1f}  {"  " * depth}{name}', file=file)
@@ -0,0 +1,94 @@
+import numpy as np
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+from time import sleep
+
+class StateTable:
+    HEADER = np.dtype([('sequence', np.uint64), ('capacity', np.uint32), ('itemsize', np.uint32)])
+    HEADER_SIZE = 64
+    DTYPE = np.dtype([
+        ('port', np.uint16),
+        ('online', np.bool_),
+        ('armed', np.bool_),
+        ('busy', np.bool_),
+        ('color', np.uint8, 3),
+        ('x', np.float64),
+        ('y', np.float64),
+        ('z', np.float64),
+        ('yaw', np.float64),
+        ('battery', np.float32),
+        ('temp', np.float32)
+    ], align=True)
+
+    def __init__(self, capacity = 1024, name = None, create = True):
+        if create:
+            self.memory = SharedMemory(name, True, self.HEADER_SIZE + capacity * self.DTYPE.itemsize)
+        else:
+            try:
+                self.memory = SharedMemory(name, track=False)
+            except TypeError:
+                self.memory = SharedMemory(name)
+                resource_tracker.unregister(self.memory._name, 'shared_memory')
+        self.header = np.ndarray((), dtype=self.HEADER, buffer=self.memory.buf)
+        if create:
+            self.header['sequence'] = 0
+            self.header['capacity'] = capacity
+            self.header['itemsize'] = self.DTYPE.itemsize
+        elif self.header['itemsize'] != self.DTYPE.itemsize:
+            raise ValueError(f'{self.memory.name} has an incompatible state layout')
+        self.rows = np.ndarray((int(self.header['capacity']),), dtype=self.DTYPE, buffer=self.memory.buf, offset=self.HEADER_SIZE)
+        if create:
+            self.rows[:] = np.zeros(1, dtype=self.DTYPE)
+        self.__owner = create
+        self.__lock = Lock()
+
+    @classmethod
+    def attach(cls, name : str) -> 'StateTable':
+        return cls(name=name, create=False)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __enter__(self):
+        self.__lock.acquire()
+        if self.header is not None:
+            self.header['sequence'] += 1
+        return self.rows
+
+    def __exit__(self, *args):
+        if self.header is not None:
+            self.header['sequence'] += 1
+        self.__lock.release()
+
+    def write(self, row : int, **fields):
+        with self as rows:
+            if rows is not None and 0 <= row < len(rows):
+                for field, value in fields.items():
+                    rows[field][row] = value
+
+    def sequence(self) -> int:
+        return int(self.header['sequence'])
+
+    def snapshot(self) -> np.ndarray:
+        while True:
+            sequence = int(self.header['sequence'])
+            if sequence % 2 == 0:
+                rows = self.rows.copy()
+                if int(self.header['sequence']) == sequence:
+                    return rows
+            sleep(0)
+
+    def close(self):
+        with self.__lock:
+            if self.rows is None:
+                return
+            self.rows = None
+            self.header = None
+            self.memory.close()
+            if self.__owner:
+                self.memory.unlink()
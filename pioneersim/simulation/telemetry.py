@@ -0,0 +1,55 @@
+from threading import Lock
+
+class TelemetryScheduler:
+    def __init__(self, engine, size = 256):
+        self.__engine = engine
+        self.__wheel = [[] for _ in range(size)]
+        self.__entries = {}
+        self.__tick = 0
+        self.__lock = Lock()
+        engine.ticked.connect(self.advance)
+
+    def __insert(self, entry : list):
+        interval = entry[0]
+        self.__wheel[(self.__tick + interval) % len(self.__wheel)].append(entry)
+        entry[1] = (interval - 1) // len(self.__wheel)
+
+    def schedule(self, owner, name : str, period : float, callback):
+        entry = [max(1, round(period * self.__engine.rate)), 0, callback]
+        with self.__lock:
+            previous = self.__entries.get((owner, name))
+            if previous is not None:
+                previous[2] = None
+            self.__entries[(owner, name)] = entry
+            self.__insert(entry)
+
+    def period(self, owner, name : str) -> float:
+        entry = self.__entries.get((owner, name))
+        if entry is None:
+            return None
+        return entry[0] / self.__engine.rate
+
+    def cancel(self, owner, name = None):
+        with self.__lock:
+            keys = [key for key in self.__entries if key[0] is owner and (name is None or key[1] == name)]
+            for key in keys:
+                self.__entries.pop(key)[2] = None
+
+    def advance(self):
+        fired = []
+        with self.__lock:
+            self.__tick += 1
+            slot = self.__wheel[self.__tick % len(self.__wheel)]
+            self.__wheel[self.__tick % len(self.__wheel)] = []
+            for entry in slot:
+                if entry[2] is None:
+                    continue
+                if entry[1] > 0:
+                    entry[1] -= 1
+                    self.__wheel[self.__tick % len(self.__wheel)].append(entry)
+                else:
+                    fired.append(entry)
+                    self.__insert(entry)
+        for entry in fired:
+            if entry[2] is not None:
+                entry[2]()
@@ -0,0 +1,150 @@
+import numpy as np
+from math import floor, ceil
+
+class FireIndex:
+    def __init__(self, radius : float, min_temp : float, static = True):
+        self.radius = radius
+        self.min_temp = min_temp
+        self.static = static
+        self.__cells = {}
+        self.__cell_of = {}
+
+    def __len__(self) -> int:
+        return len(self.__cell_of)
+
+    def __cell(self, x : float, y : float) -> tuple[int, int]:
+        return floor(x / self.radius), floor(y / self.radius)
+
+    def add(self, fire):
+        cell = self.__cell(fire.x, fire.y)
+        self.__cells.setdefault(cell, set()).add(fire)
+        self.__cell_of[fire] = cell
+
+    def remove(self, fire):
+        cell = self.__cell_of.pop(fire, None)
+        if cell is not None:
+            self.__cells[cell].discard(fire)
+            if len(self.__cells[cell]) == 0:
+                del self.__cells[cell]
+
+    def move(self, fire):
+        cell = self.__cell(fire.x, fire.y)
+        if self.__cell_of.get(fire) != cell:
+            self.remove(fire)
+            self.add(fire)
+
+    def nearby(self, x : float, y : float) -> list:
+        cell_x, cell_y = self.__cell(x, y)
+        fires = []
+        for i in range(cell_x - 1, cell_x + 2):
+            for j in range(cell_y - 1, cell_y + 2):
+                fires.extend(self.__cells.get((i, j), ()))
+        return fires
+
+    def within(self, x0 : float, y0 : float, x1 : float, y1 : float) -> list:
+        cell_x0, cell_y0 = self.__cell(x0, y0)
+        cell_x1, cell_y1 = self.__cell(x1, y1)
+        fires = []
+        for i in range(cell_x0 - 1, cell_x1 + 2):
+            for j in range(cell_y0 - 1, cell_y1 + 2):
+                fires.extend(self.__cells.get((i, j), ()))
+        return fires
+
+    def get_temp(self, x : float, y : float) -> float:
+        if len(self.__cell_of) == 0:
+            return None
+        temp = self.min_temp
+        for fire in self.nearby(x, y):
+            temp = max(temp, fire.get_temp((x, y), self.static))
+        return temp
+
+class ThermalRaster:
+    def __init__(self, width : float, height : float, resolution : float, radius : float, min_temp : float, max_temp : float, static = True):
+        self.resolution = resolution
+        self.radius = radius
+        self.min_temp = min_temp
+        self.max_temp = max_temp
+        self.static = static
+        self.field = np.full((ceil(height / resolution) + 1, ceil(width / resolution) + 1), float(min_temp))
+        self.__index = FireIndex(radius, min_temp, static)
+        self.__positions = {}
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def __rebuild(self, x : float, y : float):
+        rows, columns = self.field.shape
+        i0 = max(floor((x - self.radius) / self.resolution), 0)
+        i1 = min(ceil((x + self.radius) / self.resolution) + 1, columns)
+        j0 = max(floor((y - self.radius) / self.resolution), 0)
+        j1 = min(ceil((y + self.radius) / self.resolution) + 1, rows)
+        if i0 >= i1 or j0 >= j1:
+            return
+        grid_x, grid_y = np.meshgrid(np.arange(i0, i1) * self.resolution, np.arange(j0, j1) * self.resolution)
+        block = np.full(grid_x.shape, float(self.min_temp))
+        for fire in self.__index.within(x - self.radius, y - self.radius, x + self.radius, y + self.radius):
+            distance = np.hypot(grid_x - fire.x, grid_y - fire.y)
+            if self.static:
+                temp = np.where(distance < self.radius, self.max_temp, self.min_temp)
+            else:
+                temp = self.min_temp + np.clip(1 - distance / self.radius, 0.0, 1.0) * (self.max_temp - self.min_temp)
+            np.maximum(block, temp, out=block)
+        self.field[j0:j1, i0:i1] = block
+
+    def add(self, fire):
+        self.__index.add(fire)
+        self.__positions[fire] = (fire.x, fire.y)
+        self.__rebuild(fire.x, fire.y)
+
+    def remove(self, fire):
+        position = self.__positions.pop(fire, None)
+        self.__index.remove(fire)
+        if position is not None:
+            self.__rebuild(*position)
+
+    def move(self, fire):
+        position = self.__positions.get(fire)
+        self.__index.move(fire)
+        self.__positions[fire] = (fire.x, fire.y)
+        if position is not None:
+            self.__rebuild(*position)
+        self.__rebuild(fire.x, fire.y)
+
+    def get_temp(self, x : float, y : float) -> float:
+        if len(self.__index) == 0:
+            return None
+        rows, columns = self.field.shape
+        u = x / self.resolution
+        v = y / self.resolution
+        if not (0.0 <= u <= columns - 1 and 0.0 <= v <= rows - 1):
+            return self.__index.get_temp(x, y)
+        if self.static:
+            return float(self.field[round(v), round(u)])
+        i = min(int(u), columns - 2)
+        j = min(int(v), rows - 2)
+        du = u - i
+        dv = v - j
+        top = self.field[j, i] * (1 - du) + self.field[j, i + 1] * du
+        bottom = self.field[j + 1, i] * (1 - du) + self.field[j + 1, i + 1] * du
+        return float(top * (1 - dv) + bottom * dv)
+
+    def to_array(self) -> np.ndarray:
+        return self.field.copy()
+
+    def to_image(self) -> np.ndarray:
+        span = max(self.max_temp - self.min_temp, 1e-9)
+        level = np.clip((self.field[::-1] - self.min_temp) / span, 0.0, 1.0)
+        image = np.empty(level.shape + (3,), dtype=np.uint8)
+        image[..., 0] = (255 * level).astype(np.uint8)
+        image[..., 1] = (255 * (1 - np.abs(2 * level - 1))).astype(np.uint8)
+        image[..., 2] = (255 * (1 - level)).astype(np.uint8)
+        return image
+
+    def save(self, path : str):
+        if path.endswith('.npy'):
+            np.save(path, self.field)
+        else:
+            image = self.to_image()
+            with open(path, 'wb') as f:
+                f.write(f'P6 {image.shape[1]} {image.shape[0]} 255\n'.encode())
+                f.write(image.tobytes())
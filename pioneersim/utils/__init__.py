@@ -1 +1 @@
-from .utils import ModelType, count_by_type, get_plugin_classes
\ No newline at end of file
+from .utils import ModelType, get_plugins, remap_rgb
\ No newline at end of file
@@ -1,19 +1,7 @@
 from enum import Enum
-from pioneersim.simulation.plugins import get_plugin_classes
-from plugins.models import *
-
-__model_name = []
-__classes = get_plugin_classes('models', 'Model')
-for name in __classes:
-    __model_name.append(name.lower().replace('model', '').upper())
-
-_dynamic_code = ''
-for index in range(len(__classes)):
-    _dynamic_code += f'{__model_name[index]} = [{__classes[index]}.model_name(), {__classes[index]}]\n'
-
-class ModelType(Enum):
-    exec(_dynamic_code)
+from pioneersim.simulation.plugins import get_plugins
 
+class PluginType(Enum):
     def __str__(self):
         return self.value[0]
 
@@ -31,9 +19,7 @@ class ModelType(Enum):
     def get_str_list(cls):
         return [str(cls[name]) for name in cls._member_names_]
 
-def count_by_type(objects : list, model_type: ModelType):
-    id = 0
-    for obj in objects:
-        if type(obj) == model_type.model:
-            id += 1
-    return id
\ No newline at end of file
+ModelType = PluginType('ModelType', [(name.lower().replace('model', '').upper(), [cls.model_name(), cls]) for name, cls in get_plugins('models').items()], module=__name__)
+
+def remap_rgb(r : int, g : int, b : int) -> tuple[float, float, float]:
+    return r / 255, g / 255, b / 255
\ No newline at end of file
@@ -1,7 +1,6 @@
 
-from pioneersim.utils import ModelType, get_plugin_classes
+from pioneersim.utils import ModelType, get_plugins
 from pioneersim.settings.language import Language
-from plugins.widgets import *
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget, QGridLayout, QListWidget, QPushButton, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QListWidgetItem, QDialog, QComboBox
 
@@ -19,12 +18,10 @@ class ObjectDialog(QDialog):
 
         self.objects_loader = {}
         
-        classes = get_plugin_classes('widgets', 'ObjectDialogLoader')
-        for index in range(len(ModelType._member_names_)):
-            model_type = ModelType[ModelType._member_names_[index]]
-            for loader_classes in classes:
-                if str(model_type) == loader_classes.replace('DialogLoader', '').lower():
-                    exec(f"self.objects_loader[model_type] = {loader_classes}")
+        classes = {name.replace('DialogLoader', '').lower() : cls for name, cls in get_plugins('widgets').items()}
+        for model_type in ModelType:
+            if str(model_type) in classes:
+                self.objects_loader[model_type] = classes[str(model_type)]
 
         self.setWindowModality(Qt.ApplicationModal)
 
@@ -100,13 +97,18 @@ class ObjectDialog(QDialog):
         super().exec_()
         return self.__type, self.__fields
 
+def describe(type : ModelType, field : list) -> str:
+    return f"Тип: {Language.get_word(str(type))}, " + type.model.get_description(field)
+
 class MenuWidgetItem(QWidget):
-    def __init__(self, type : ModelType, field = None):
+    def __init__(self, type : ModelType, field = None, item : QListWidgetItem = None):
         self.__type = type
         self.__field = field
+        self.__item = item
 
         super().__init__()
         self.setContentsMargins(0, 0, 0, 0)
+        self.setAutoFillBackground(True)
 
         layout = QHBoxLayout(self)
         self.text = QLabel()
@@ -124,11 +126,14 @@ class MenuWidgetItem(QWidget):
         dialog = ObjectDialog(self.__type, self.__field)
         _, fields = dialog.exec_()
         if fields is not None:
-            self.__set_text()
             self.__field = fields
+            self.__set_text()
+            if self.__item is not None:
+                self.__item.setData(Qt.UserRole, (self.__type, fields))
+                self.__item.setText(describe(self.__type, fields))
 
     def __set_text(self):
-        self.text.setText(f"Тип: {Language.get_word(str(self.__type))}, " + self.__type.model.get_description(self.__field))
+        self.text.setText(describe(self.__type, self.__field))
 
     def get_start_data(self) -> tuple:
         return self.__type, self.__field
@@ -141,7 +146,10 @@ class MenuWidget(QWidget):
 
         self.list = QListWidget(self)
         self.list.setContentsMargins(0, 0, 0, 100)
+        self.list.setUniformItemSizes(True)
         self.list.clicked.connect(self.__remove_button_activate)
+        self.list.currentItemChanged.connect(self.__attach_widget)
+        self.__row_size = None
 
         self.add_button = QPushButton(self)
         self.add_button.setText("Добавить объект")
@@ -171,24 +179,37 @@ class MenuWidget(QWidget):
 
     def add_object(self, type : ModelType, fields : list):
         if type is not None:
-            widget = MenuWidgetItem(type, fields)
-            new_item = QListWidgetItem()
-            new_item.setSizeHint(widget.sizeHint()) 
+            self.add_objects([(type, fields)])
+
+    def add_objects(self, objects : list):
+        self.list.setUpdatesEnabled(False)
+        for type, fields in objects:
+            new_item = QListWidgetItem(describe(type, fields))
+            new_item.setData(Qt.UserRole, (type, fields))
+            if self.__row_size is None:
+                self.__row_size = MenuWidgetItem(type, fields).sizeHint()
+            new_item.setSizeHint(self.__row_size)
             self.list.addItem(new_item)
-            self.list.setItemWidget(new_item, widget)
+        self.list.setUpdatesEnabled(True)
+
+    def __attach_widget(self, current : QListWidgetItem, previous : QListWidgetItem):
+        if previous is not None and previous.listWidget() is self.list:
+            self.list.removeItemWidget(previous)
+        if current is not None:
+            type, fields = current.data(Qt.UserRole)
+            self.list.setItemWidget(current, MenuWidgetItem(type, fields, current))
 
     def remove_current(self) -> int:
         row = self.list.currentRow()
+        item = self.list.item(row)
+        if item is not None:
+            self.list.removeItemWidget(item)
         self.list.takeItem(row)
         self.remove_button.setEnabled(False)
         return row
 
-    def get_items(self) -> list[MenuWidgetItem]:
-        items = [self.list.item(x) for x in range(self.list.count())]
-        widgets = []
-        for item in items:
-            widgets.append(self.list.itemWidget(item))
-        return widgets
+    def get_objects(self) -> list[tuple]:
+        return [self.list.item(row).data(Qt.UserRole) for row in range(self.list.count())]
 
     def __remove_button_activate(self):
         self.remove_button.setEnabled(True)
\ No newline at end of file
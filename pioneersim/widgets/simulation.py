@@ -1,87 +1,18 @@
-from threading import Thread
-from time import sleep
-from PyQt5.QtGui import QFont
-from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QScrollArea, QVBoxLayout, QLabel
-from pioneersim.managers import ObjectsManager
-from pioneersim.utils import ModelType
-from pioneersim.settings.language import Language
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QVBoxLayout
+from pioneersim.widgets.status import StatusWidget
 from ObjectVisualizator.main import VisWidget
 
-class StatusWidget(QWidget):
-    def __init__(self, server : ObjectsManager):
-        self.__server = server
-        super().__init__()
-
-        self.main_layout = QVBoxLayout(self)
-
-        self.__updateble_label = []
-        self.setGeometry(200, 200, 500, 500)
-        self.setWindowTitle("Статус")
-
-        self.setContentsMargins(0, 0, 0, 0)
-
-    def update(self):
-        if self.main_layout.count() != 0:
-            self.main_layout.removeWidget(self.main_layout.itemAt(0).widget())
-        self.__updateble_label = []
-        scroll_layout = QVBoxLayout(self)
-        scroll_layout.setContentsMargins(0, 0, 0, 0)
-
-        scroll_area = QScrollArea(self)
-        scroll_area.setContentsMargins(0, 0, 0, 0)
-
-        widget = QWidget(scroll_area)
-        widget.setLayout(scroll_layout)
-        widget.setContentsMargins(0, 0, 0, 0)
-
-        font = QFont("Times", 16)
-
-        for name in ModelType._member_names_:
-            model_type = ModelType[name]
-            if model_type.model.status():
-                status = self.__server.get_status_info_by_type(model_type)
-
-                for index in range(len(status)):
-                    status_widget = QWidget(self)
-                    layout = QVBoxLayout(status_widget)
-                    drone_name = QLabel(f'{Language.get_word(str(model_type))} - {index + 1}')
-                    drone_name.setFont(font)
-                    layout.addWidget(drone_name)
-                    for name, value in status[index].items():
-                        value_str = f'\t{Language.get_word(name)} : {Language.get_word(str(value))}'
-                        self.__updateble_label.append(QLabel(value_str))
-                        layout.addWidget(self.__updateble_label[-1])
-                    status_widget.setLayout(layout)
-                    scroll_layout.addWidget(status_widget)
-
-        scroll_area.setWidget(widget)
-        self.main_layout.addWidget(scroll_area)
-
-    def __update_label_target(self, type):
-        while not self.isHidden():
-            status = self.__server.get_status_info_by_type(type)
-            update_index = 0
-            for index in range(len(status)):
-                for name, value in status[index].items():
-                    self.__updateble_label[update_index].setText(f'\t{Language.get_word(name)} : {Language.get_word(str(value))}')
-                    update_index += 1
-            sleep(0.01)
-
-    def open(self):
-        if self.isHidden():
-            self.show()
-            for name in ModelType._member_names_:
-                model_type = ModelType[name]
-                if model_type.model.status():
-                    Thread(target=self.__update_label_target, args=(model_type,)).start()
-        else:
-            self.hide()
-
 class SimWidget(QWidget):
     def __init__(self, world, main, server):
         super().__init__()
 
-        self.status_widget = StatusWidget(server)
+        self.status_widget = StatusWidget(server, world.settings.simulation.status_rate)
+
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(int(1000 / world.settings.simulation.render_fps))
+        self.render_timer.timeout.connect(server.flush)
+        self.render_timer.start()
 
         self.vis_widget = VisWidget(world, main, server)
         self.vis_widget.setContentsMargins(0, 0, 0 , 100)
@@ -0,0 +1,106 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QHeaderView
+from pioneersim.managers import ObjectsManager
+from pioneersim.utils import ModelType
+from pioneersim.settings.language import Language
+
+class StatusTableModel(QAbstractTableModel):
+    def __init__(self, server : ObjectsManager):
+        super().__init__()
+        self.__server = server
+        self.__columns = []
+        self.__rows = []
+
+    def rowCount(self, parent = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.__rows)
+
+    def columnCount(self, parent = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.__columns) + 1
+
+    def data(self, index : QModelIndex, role = Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.__rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section : int, orientation, role = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            if section == 0:
+                return "Объект"
+            return Language.get_word(self.__columns[section - 1])
+        return None
+
+    def __collect(self) -> tuple[list, list]:
+        columns = []
+        statuses = []
+        for name in ModelType._member_names_:
+            model_type = ModelType[name]
+            if model_type.model.status():
+                for index, status in enumerate(self.__server.get_status_info_by_type(model_type)):
+                    statuses.append((f'{Language.get_word(str(model_type))} - {index + 1}', status))
+                    for key in status:
+                        if key not in columns:
+                            columns.append(key)
+        rows = []
+        for name, status in statuses:
+            rows.append([name] + [Language.get_word(str(status[key])) if key in status else '' for key in columns])
+        return columns, rows
+
+    def refresh(self):
+        columns, rows = self.__collect()
+        if columns != self.__columns or len(rows) != len(self.__rows):
+            self.beginResetModel()
+            self.__columns = columns
+            self.__rows = rows
+            self.endResetModel()
+            return
+        for row in range(len(rows)):
+            changed = [column for column in range(len(rows[row])) if rows[row][column] != self.__rows[row][column]]
+            if len(changed) != 0:
+                self.__rows[row] = rows[row]
+                self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]), [Qt.DisplayRole])
+
+class StatusWidget(QWidget):
+    def __init__(self, server : ObjectsManager, rate = 5):
+        super().__init__()
+
+        self.model = StatusTableModel(server)
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setFont(QFont("Times", 16))
+        self.view.verticalHeader().hide()
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.model.refresh)
+        self.__rate = rate
+        if rate > 0:
+            self.timer.setInterval(int(1000 / rate))
+
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout.addWidget(self.view)
+        self.setGeometry(200, 200, 500, 500)
+        self.setWindowTitle("Статус")
+
+        self.setContentsMargins(0, 0, 0, 0)
+
+    def update(self):
+        self.model.refresh()
+
+    def open(self):
+        if self.isHidden():
+            self.model.refresh()
+            self.show()
+            if self.__rate > 0:
+                self.timer.start()
+        else:
+            self.hide()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
@@ -1,10 +1,15 @@
-from pioneersim.utils import ModelType
+from typing import TYPE_CHECKING
+from pioneersim.utils import ModelType, remap_rgb
 from pioneersim.simulation.manager import ModelManager
-from ObjectVisualizator.main import VisualizationWorld, remapRGB
+from pioneersim.simulation.plugins import register
 
+if TYPE_CHECKING:
+    from ObjectVisualizator.main import VisualizationWorld
+
+@register('managers')
 class AreaModelManager(ModelManager):
 
-    def __init__(self, objects: list, visualization: VisualizationWorld):
+    def __init__(self, objects: list, visualization: 'VisualizationWorld'):
         super().__init__(objects, visualization)
         self.object_type = ModelType.AREA
 
@@ -14,14 +19,14 @@ class AreaModelManager(ModelManager):
         self.objects.append(self.object_type.model(*fields[0], fields[-2]))
         self.visualization.add_model(str(self.object_type), (*fields[0], 0.0), 0, False)
         self.visualization.change_model_scale(-1, (x, y, z))
-        self.visualization.change_model_color(-1, *remapRGB(*fields[-1]))
+        self.visualization.change_model_color(-1, *remap_rgb(*fields[-1]))
 
     def update_model(self, index: int, fields: list):
         x, y, z = fields[1]
         x, y, z = x, z, y
         self.visualization.change_model_position(index, (*fields[0], 0), 0)
         self.visualization.change_model_scale(index, (x, y, z))
-        self.visualization.change_model_color(index,  *remapRGB(*fields[-1]))
+        self.visualization.change_model_color(index,  *remap_rgb(*fields[-1]))
         self.objects[index].set_position(*fields[0])
 
     def remove_model(self, index: int):
@@ -1,24 +1,107 @@
-from pioneersim.utils import ModelType
+import atexit, os
+from itertools import count
+from functools import partial
+from typing import TYPE_CHECKING
+from pioneersim.utils import ModelType, remap_rgb
 from pioneersim.simulation.manager import ModelManager
-from ObjectVisualizator.main import VisualizationWorld, remapRGB
-from PyQt5.QtCore import QObject
+from pioneersim.simulation.engine import PhysicsEngine
+from pioneersim.simulation.clock import SimulationClock
+from pioneersim.simulation.reactor import MavlinkReactor
+from pioneersim.simulation.render import RenderSync
+from pioneersim.simulation.telemetry import TelemetryScheduler
+from pioneersim.simulation.shard import ShardPool
+from pioneersim.simulation.state import StateTable
+from pioneersim.simulation.plugins import register
 
+if TYPE_CHECKING:
+    from ObjectVisualizator.main import VisualizationWorld
+
+@register('managers')
 class DroneModelManager(ModelManager):
-    
-    def __init__(self, objects: list, visualization: VisualizationWorld):
+    __tables = count()
+
+    def __init__(self, objects: list, visualization: 'VisualizationWorld'):
         super().__init__(objects, visualization)
         self.object_type = ModelType.DRONEMAVLINK
-        self.__signaler = QObject()
+        headless = getattr(self.visualization, 'headless', False)
+        lockstep = self.visualization.settings.simulation.lockstep and headless
+        self.engine = PhysicsEngine(
+            self.visualization.settings.simulation.rate,
+            clock = SimulationClock(self.visualization.settings.simulation.time_scale),
+            lockstep = lockstep,
+            acceleration = self.visualization.settings.simulation.acceleration,
+            yaw_acceleration = self.visualization.settings.simulation.yaw_acceleration
+        )
+        self.reactor = MavlinkReactor(lockstep)
+        self.render = RenderSync(self.visualization.settings.simulation.render_fps)
+        self.telemetry = TelemetryScheduler(self.engine)
+        self.render.frame.connect(self.__render_frame)
+        if headless:
+            self.engine.ticked.connect(self.render.update)
+        self.shards = None
+        self.__sharded = set()
+        if self.visualization.settings.simulation.shards > 0 and not lockstep:
+            self.shards = ShardPool(self.visualization.settings.__dict__(), self.visualization.settings.simulation.shards)
+            if headless:
+                self.shards.received.connect(self.render.update)
+            atexit.register(self.shards.shutdown)
+        self.state = None
+        self.__rows = {}
+        self.__free_rows = []
+        if self.visualization.settings.simulation.state_capacity > 0:
+            name = self.visualization.settings.simulation.state_name
+            if name == '':
+                number = next(DroneModelManager.__tables)
+                name = f'pioneersim-{os.getpid()}' if number == 0 else f'pioneersim-{os.getpid()}-{number}'
+            self.state = StateTable(self.visualization.settings.simulation.state_capacity, name)
+            atexit.register(self.state.close)
+            if self.shards is None:
+                self.engine.ticked.connect(self.__publish)
+            else:
+                self.__free_rows = list(range(len(self.state) - 1, -1, -1))
+                self.shards.received.connect(self.__publish_shards)
 
     def __get_index_by_model(self, model):
-        for index in range(len(self.objects)):
-            if (self.objects[index].model == model) and (type(self.objects[index]) == ModelType.DRONEMAVLINK.model):
-                return index
-        return -1
+        return self.objects.index(self.objects.handle_of(model))
+
+    def __publish(self):
+        engine = self.engine
+        count = min(len(engine.mode), len(self.state))
+        with self.state as rows:
+            if rows is None:
+                return
+            rows = rows[:count]
+            rows['online'] = engine.used[:count]
+            rows['busy'] = engine.mode[:count] != engine.IDLE
+            rows['armed'] = engine.battery.armed[:count]
+            rows['battery'] = engine.battery.get_voltages()[:count]
+            rows['x'] = engine.position[:count, 0]
+            rows['y'] = engine.position[:count, 1]
+            rows['z'] = engine.position[:count, 2]
+            rows['yaw'] = engine.yaw[:count]
 
-    def __drone_change_position(self):
+    def __publish_shards(self):
+        with self.state as rows:
+            if rows is None:
+                return
+            for model, row in list(self.__rows.items()):
+                rows['online'][row] = model.online
+                rows['armed'][row] = model.preflight_status
+                rows['battery'][row] = model.get_battery()
+                rows['x'][row] = model.x
+                rows['y'][row] = model.y
+                rows['z'][row] = model.z
+                rows['yaw'][row] = model.yaw
+
+    def __release_row(self, model):
+        row = self.__rows.pop(model, None)
+        if row is not None:
+            self.state.write(row, online = False)
+            self.__free_rows.append(row)
+
+    def __drone_change_position(self, model):
         if self.run:
-            index = self.__get_index_by_model(self.__signaler.sender())
+            index = self.__get_index_by_model(model)
             if index != -1:
                 position = self.objects[index].get_position()
                 self.visualization.change_model_position(
@@ -26,18 +109,25 @@ class DroneModelManager(ModelManager):
                     position,
                     self.objects[index].get_yaw()
                 )
-                for fire in [f for f in self.objects if type(f) == ModelType.FIRE.model()]:
-                    temp = fire.get_temp(
-                        tuple(position[0:2]),
-                        self.visualization.settings.simulation.fire_static
-                    )
-                    self.objects[index].set_temp(fire.id, temp)
-
-    def __drone_change_color(self):
+                temp = self.objects.thermal.get_temp(*position[0:2])
+                if temp is not None:
+                    self.objects[index].set_temp(temp)
+                    if self.state is not None:
+                        self.state.write(self.__rows.get(model, -1), temp = temp)
+
+    def __render_frame(self, positions : set, colors : set):
+        for model in positions:
+            self.__drone_change_position(model)
+        for model in colors:
+            self.__drone_change_color(model)
+
+    def __drone_change_color(self, model):
         if self.run:
-            index = self.__get_index_by_model(self.__signaler.sender())
+            index = self.__get_index_by_model(model)
             if index != -1:
                 new_color = self.objects[index].get_led_color()
+                if self.state is not None:
+                    self.state.write(self.__rows.get(model, -1), color = new_color)
                 model_color = self.visualization.get_model_color(index)
                 if new_color != model_color:
                     if not any(model_color):
@@ -45,6 +135,20 @@ class DroneModelManager(ModelManager):
                     else:
                         self.visualization.change_model_color(index, *new_color)
 
+    def get_status(self) -> list:
+        drones = self.objects.by_type(self.object_type.model)
+        if self.state is None:
+            return [drone.get_status() for drone in drones]
+        rows = self.state.snapshot()
+        statuses = []
+        for drone in drones:
+            row = self.__rows.get(drone.model, -1) if drone.model is not None else -1
+            if row == -1 or not rows['online'][row]:
+                statuses.append(drone.get_status())
+            else:
+                statuses.append({"arm" : bool(rows['armed'][row]), "power" : f"{round(float(rows['battery'][row]), 1)} V."})
+        return statuses
+
     def create_model(self, fields: list):
         self.visualization.add_model(str(self.object_type), fields[-2], 0, True, fields[-1])
         self.objects.append(self.object_type.model(
@@ -53,25 +157,65 @@ class DroneModelManager(ModelManager):
             battery_need = self.visualization.settings.simulation.battery_need,
             battery_capacity = self.visualization.settings.simulation.battery_capacity,
             battery_max = self.visualization.settings.simulation.battery_max,
-            battery_off = self.visualization.settings.simulation.battery_off
+            battery_off = self.visualization.settings.simulation.battery_off,
+            engine = self.engine,
+            reactor = self.reactor,
+            telemetry = self.telemetry,
+            rates = {
+                'heartbeat' : self.visualization.settings.simulation.heartbeat_rate,
+                'position' : self.visualization.settings.simulation.position_rate,
+                'mission' : self.visualization.settings.simulation.mission_rate,
+                'sensor' : self.visualization.settings.simulation.sensor_rate
+            },
+            delta = self.visualization.settings.simulation.telemetry_delta,
+            epsilon = self.visualization.settings.simulation.telemetry_epsilon,
+            keepalive = self.visualization.settings.simulation.telemetry_keepalive,
+            shard = self.shards
         ))
 
     def update_model(self, index : int, fields: list):
         self.objects[index].set_start_position(*fields[2])
         self.objects[index].set_hostname(fields[0])
         self.objects[index].set_port(fields[1])
-        self.visualization.change_trajectory_color(index, *remapRGB(*fields[-1]))
+        self.visualization.change_trajectory_color(index, *remap_rgb(*fields[-1]))
 
     def remove_model(self, index: int):
         self.close(index)
 
     def start(self, index: int):
         self.objects[index].start()
-        self.objects[index].model.change_position.connect(self.__drone_change_position)
-        self.objects[index].model.change_color.connect(self.__drone_change_color)
-        self.objects[index].model.change_position.emit()
-        self.objects[index].model.change_color.emit()
+        model = self.objects[index].model
+        self.objects.bind(model, self.objects.handle(index))
+        if self.state is not None:
+            if self.shards is None:
+                self.__rows[model] = model.slot
+            elif len(self.__free_rows) != 0:
+                self.__rows[model] = self.__free_rows.pop()
+                model.offline.connect(partial(self.__release_row, model))
+            self.state.write(self.__rows.get(model, -1), port = self.objects[index].port, online = True, temp = model.get_temp())
+        if self.shards is not None:
+            self.__sharded.add(model)
+        model.change_position.connect(partial(self.render.mark_position, model))
+        model.change_color.connect(partial(self.render.mark_color, model))
+        model.change_position.emit()
+        model.change_color.emit()
 
     def close(self, index : int):
         self.objects[index].online = False
-    
\ No newline at end of file
+        if self.shards is not None and len(self.__sharded) != 0:
+            self.__sharded.discard(self.objects[index].model)
+            if len(self.__sharded) == 0:
+                self.shards.shutdown()
+
+    def step(self, ticks : int):
+        for _ in range(ticks):
+            self.reactor.poll()
+            self.engine.step()
+
+    def flush(self):
+        self.render.flush()
+
+    def serve(self, timeout : float):
+        self.reactor.poll(timeout)
+        while self.engine.pending():
+            self.step(1)
@@ -1,15 +1,20 @@
-from pioneersim.utils import ModelType, count_by_type
+from typing import TYPE_CHECKING
+from pioneersim.utils import ModelType, remap_rgb
 from pioneersim.simulation.manager import ModelManager
-from ObjectVisualizator.main import VisualizationWorld, remapRGB
+from pioneersim.simulation.plugins import register
 
+if TYPE_CHECKING:
+    from ObjectVisualizator.main import VisualizationWorld
+
+@register('managers')
 class FireModelManager(ModelManager):
 
-    def __init__(self, objects: list, visualization: VisualizationWorld):
+    def __init__(self, objects: list, visualization: 'VisualizationWorld'):
         super().__init__(objects, visualization)
         self.object_type = ModelType.FIRE
 
     def create_model(self, fields: list):
-        id = count_by_type(self.objects, self.object_type)
+        id = self.objects.count(self.object_type.model)
         self.objects.append(self.object_type.model(
             id,
             *fields[-1],
@@ -17,15 +22,17 @@ class FireModelManager(ModelManager):
             self.visualization.settings.simulation.fire_max_temp,
             self.visualization.settings.simulation.fire_radius
         ))
+        self.objects.thermal.add(self.objects[-1])
         self.visualization.add_model(str(self.object_type), (*fields[-1], 0.0), 0, False)
-        self.visualization.change_model_color(-1, *remapRGB(200, 44, 31))
+        self.visualization.change_model_color(-1, *remap_rgb(200, 44, 31))
 
     def update_model(self, index: int, fields: list):
         self.visualization.change_model_position(index, (*fields[0], 0), 0)
         self.objects[index].set_position(*fields[0])
+        self.objects.thermal.move(self.objects[index])
 
     def remove_model(self, index: int):
-        pass
+        self.objects.thermal.remove(self.objects[index])
 
     def start(self, index: int):
         pass
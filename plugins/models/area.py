@@ -1,5 +1,7 @@
 from pioneersim.simulation.model import Model
+from pioneersim.simulation.plugins import register
 
+@register('models')
 class AreaModel(Model):
     def __init__(self, x = 0.0, y = 0.0, scale = (0.0, 0.0, 0.0)):
         self.x = x
@@ -1,52 +1,94 @@
-from time import sleep, time
-from threading import Thread
-from pymavlink import mavutil
-from pymavlink.dialects.v20 import common
-from PyQt5.QtCore import pyqtSignal, QObject
-from math import sqrt, cos, sin, radians
+from functools import partial
+from threading import Lock
+from pioneersim.simulation.startup import lazy_import
 from pioneersim.simulation.model import Model
-
-class SimpleDroneModel(QObject):
-    change_position = pyqtSignal()
-    change_color = pyqtSignal()
-
-    def __init__(self, x = 0.0, y= 0.0, z = 0.0, yaw = 0.0, speed = 60, battery_need = True, battery_capacity = 1300, battery_voltage = 7.2):
-        super().__init__()
+from pioneersim.simulation.engine import PhysicsEngine
+from pioneersim.simulation.reactor import MavlinkReactor
+from pioneersim.simulation.telemetry import TelemetryScheduler
+from pioneersim.simulation.motion import MotionController
+from pioneersim.simulation.signals import Signal
+from pioneersim.simulation import metrics
+from pioneersim.simulation.plugins import register
+
+common = lazy_import('pymavlink.dialects.v20.common')
+
+class SimpleDroneModel:
+    def __init__(self, x = 0.0, y= 0.0, z = 0.0, yaw = 0.0, speed = 60, battery_need = True, battery_capacity = 1300, battery_voltage = 7.2, engine = None):
         battery_time = battery_capacity * 27.7
-        self.x = x
-        self.y = y
-        self.z = z
-        self.yaw = yaw
-        self.speed = speed
+        self.change_position = Signal()
+        self.change_color = Signal()
+        if engine is None:
+            engine = PhysicsEngine()
+        self.__engine = engine
+        self.__slot = engine.add(x, y, z, yaw, speed, self.change_position.emit)
+        self.__engine.battery.reset(self.__slot, battery_time, battery_voltage, battery_need)
+        self.motion = MotionController(engine, self.__slot)
+        self.motion.finished.connect(self.__motion_finished)
         self.color = (0, 0, 0)
-        self.__temp_sensor_data = []
-        self.__current_battery = battery_time
+        self.__temp = 20.0
 
         self.takeoff_status = False
         self.preflight_status = False
-        self.inprogress = False
+        self.__inprogress = False
+        self.__maneuver = False
         self.__last_position = (x, y, z, yaw)
-        self.__max_battery = battery_time
-        self.__battery_voltage = battery_voltage
 
-        if battery_need:
-            Thread(target=self.__battery_target).start()
+    @property
+    def slot(self) -> int:
+        return self.__slot
+
+    @property
+    def x(self) -> float:
+        return float(self.__engine.position[self.__slot][0])
+
+    @property
+    def y(self) -> float:
+        return float(self.__engine.position[self.__slot][1])
+
+    @property
+    def z(self) -> float:
+        return float(self.__engine.position[self.__slot][2])
+
+    @property
+    def yaw(self) -> float:
+        return float(self.__engine.yaw[self.__slot])
+
+    @property
+    def speed(self) -> float:
+        return float(self.__engine.speed[self.__slot])
+
+    @speed.setter
+    def speed(self, speed : float):
+        self.__engine.speed[self.__slot] = speed
+
+    @property
+    def preflight_status(self) -> bool:
+        return bool(self.__engine.battery.armed[self.__slot])
+
+    @preflight_status.setter
+    def preflight_status(self, preflight_status : bool):
+        self.__engine.battery.armed[self.__slot] = preflight_status
+
+    @property
+    def inprogress(self) -> bool:
+        return self.__inprogress
+
+    @inprogress.setter
+    def inprogress(self, inprogress : bool):
+        self.__inprogress = inprogress
+        if not inprogress:
+            self.__cancel()
+
+    @property
+    def maneuver(self) -> bool:
+        return self.__maneuver
 
     def stop(self):
-        self.__current_battery = -1
-        
-    def __battery_target(self):
-        while self.__current_battery > 0.0:
-            if self.preflight_status:
-                self.__current_battery -= 1
-                sleep(1)
-            else:
-                self.__current_battery -= 0.5
-                sleep(1)
+        self.__engine.remove(self.__slot)
 
     def set_color(self, r = 0, g = 0, b = 0):
-        self.change_color.emit()
         self.color = (r, g, b)
+        self.change_color.emit()
 
     def check_pos(self, x : float, y : float, z : float, yaw : float) -> bool:
         return (x, y, z, yaw) != self.__last_position
@@ -54,115 +96,175 @@ class SimpleDroneModel(QObject):
     def set_pos(self, x : float, y : float, z : float, yaw : float):
         self.__last_position = (x, y, z, yaw)
 
-    def go_to_point(self, x : float, y : float, z : float):
-        delta_x = x - self.x
-        delta_y = y - self.y
-        delta_z = z - self.z
-        l = sqrt(delta_x ** 2 + delta_y ** 2 + delta_z ** 2)
-        for _ in range(int(l * 100) - 1):
-            if self.inprogress:
-                self.x += delta_x / l * 0.01
-                self.y += delta_y / l * 0.01
-                self.z += delta_z / l * 0.01
-                self.change_position.emit()
-            else:
-                return
-            sleep(1.0 / self.speed)
-
-    def update_yaw(self, angle : float):
-        old_angle = int(self.yaw)
-        pri = 1
-        if angle < 0.0:
-            pri = -1
-        for new_angle in range(old_angle, old_angle + int(angle), pri):
-            if self.inprogress:
-                self.yaw = new_angle
-                self.change_position.emit()
-            else:
-                return
-            sleep(1.0 / self.speed)
+    def __cancel(self):
+        self.motion.cancel()
+        self.set_pos(-1, -1, -1, -1)
+
+    def set_target(self, x : float, y : float, z : float, yaw : float):
+        self.__inprogress = True
+        self.motion.set_target(x, y, z, yaw)
+
+    def enqueue(self, x : float, y : float, z : float, yaw : float):
+        self.__inprogress = True
+        self.motion.enqueue(x, y, z, yaw)
+
+    def __motion_finished(self):
+        self.__inprogress = False
 
-    def takeoff(self):
+    def drive(self, vx : float, vy : float, vz : float, yaw_rate : float, timeout : float):
+        self.__cancel()
+        self.__inprogress = True
+        self.__engine.drive(self.__slot, vx, vy, vz, yaw_rate, timeout, self.__drive_finished)
+
+    def __drive_finished(self):
+        self.__inprogress = False
+
+    def takeoff(self, callback = None):
+        self.__cancel()
         self.inprogress = True
-        for _ in range(100):
-            self.z += 0.01
-            self.change_position.emit()
-            sleep(1.0 / self.speed)
+        self.__maneuver = True
+        self.__engine.move(self.__slot, self.x, self.y, self.z + 1.0, lambda: self.__takeoff_finished(callback))
+
+    def __takeoff_finished(self, callback):
         self.takeoff_status = True
+        self.__maneuver = False
         self.inprogress = False
+        if callback is not None:
+            callback()
 
-    def landing(self):
+    def landing(self, callback = None):
+        self.__cancel()
         self.inprogress = True
-        for _ in range(int(self.z * 100)):
-            self.z -= 0.01
-            self.change_position.emit()
-            sleep(1.0 / self.speed)
+        self.__maneuver = True
+        self.__engine.move(self.__slot, self.x, self.y, 0.0, lambda: self.__landing_finished(callback))
+
+    def __landing_finished(self, callback):
         self.takeoff_status = False
         self.preflight_status = False
+        self.__maneuver = False
         self.inprogress = False
         self.set_pos(self.x, self.y, 0.0, self.yaw)
+        if callback is not None:
+            callback()
 
     def disarm(self):
-        self.z = 0.0
-        self.change_position.emit()
+        self.__engine.place(self.__slot, self.x, self.y, 0.0)
         self.preflight_status = False
         self.takeoff_status = False
         self.set_pos(self.x, self.y, 0.0, self.yaw)
        
     def get_temp(self) -> float:
-        if len(self.__temp_sensor_data) != 0:
-            return max(self.__temp_sensor_data)
-        else:
-            return 20.0
+        return self.__temp
         
-    def set_temp(self, id, temp):
-        if id < len(self.__temp_sensor_data):
-            self.__temp_sensor_data[id] = temp
-        else:
-            self.__temp_sensor_data.append(temp)
+    def set_temp(self, temp : float):
+        self.__temp = temp
 
     def get_battery(self) -> float:
-        return round(self.__current_battery / self.__max_battery * self.__battery_voltage, 1)
+        return self.__engine.battery.get_voltage(self.__slot)
 
+@register('models')
 class DroneMavlinkModel(Model):
-    def __init__(self, hostname='localhost', port=8001, start_position = (0, 0, 0), speed = 60, battery_need = True, battery_capacity = 1300, battery_max = 7.2, battery_off = 6.6, heartbeat_rate = 1/10):
+    STREAMS = {
+        0 : 'heartbeat', # HEARTBEAT
+        32 : 'position', # LOCAL_POSITION_NED
+        46 : 'mission', # MISSION_ITEM_REACHED
+        132 : 'sensor' # DISTANCE_SENSOR
+    }
+    DATA_STREAMS = {
+        0 : ('position', 'mission', 'sensor'), # MAV_DATA_STREAM_ALL
+        1 : ('sensor',), # MAV_DATA_STREAM_RAW_SENSORS
+        6 : ('position', 'mission') # MAV_DATA_STREAM_POSITION
+    }
+
+    RC_TIMEOUT = 0.5
+
+    def __init__(self, hostname='localhost', port=8001, start_position = (0, 0, 0), speed = 60, battery_need = True, battery_capacity = 1300, battery_max = 7.2, battery_off = 6.6, heartbeat_rate = 1/10, engine = None, reactor = None, telemetry = None, rates = None, delta = False, epsilon = 0.01, keepalive = 1.0, shard = None):
         self.hostname = hostname
-        self.online = False
+        self.__online = False
+        self.__shard = shard
         self.port = port
         self.heartbeat_rate = heartbeat_rate
-        self.__item = 0
         self.model = None
         self.master = None
-        self.__live_thread = None
-        self.__message_thread = None
+        self.__session = None
+        self.__session_lock = Lock()
+        self.__takeoff_once = False
+        self.__landing_once = False
         self.__speed = speed
         self.__battery_need = battery_need
         self.__battery_capacity = battery_capacity
         self.__battery_max = battery_max
         self.__battery_off = battery_off
         self.__start_position = start_position
+        self.__engine = engine
+        self.__reactor = reactor
+        self.__telemetry = telemetry
+        if rates is None:
+            rates = {'heartbeat' : 1, 'position' : 30, 'mission' : 30, 'sensor' : 10}
+        self.__default_rates = dict(rates)
+        self.__rates = dict(rates)
+        self.__delta = delta
+        self.__epsilon = epsilon
+        self.__keepalive = keepalive
+        self.__sent = {}
+        self.__streams = {
+            'heartbeat' : self.__heartbeat_send,
+            'position' : self.__position_send,
+            'mission' : self.__mission_send,
+            'sensor' : lambda: self.__distance_sensor_send(common.MAV_DISTANCE_SENSOR_UNKNOWN)
+        }
+
+    @property
+    def online(self) -> bool:
+        return self.__online
+
+    @online.setter
+    def online(self, online : bool):
+        self.__online = online
+        if not online and self.__shard is not None and self.model is not None:
+            self.model.stop()
+
+    def __remote_offline(self):
+        self.__online = False
 
     def __heartbeat_send(self):
         self.master.mav.heartbeat_send(
-            type = mavutil.mavlink.MAV_TYPE_ONBOARD_CONTROLLER,
-            autopilot = mavutil.mavlink.MAV_AUTOPILOT_INVALID,
+            type = common.MAV_TYPE_ONBOARD_CONTROLLER,
+            autopilot = common.MAV_AUTOPILOT_INVALID,
             base_mode = 0,
             custom_mode = 0,
             system_status = 0
         )
 
-    def __status_send(self):
+    def __changed(self, name : str, values : tuple) -> bool:
+        if not self.__delta:
+            return True
+        now = self.__engine.clock.time()
+        last = self.__sent.get(name)
+        if last is None or now - last[1] >= self.__keepalive or any(abs(value - sent) > self.__epsilon for value, sent in zip(values, last[0])):
+            self.__sent[name] = (values, now)
+            return True
+        return False
+
+    def __position_send(self):
         self.master.mav.srcComponent = 26
-        self.master.mav.local_position_ned_send(int(time()), self.model.x, self.model.y, self.model.z, 0, 0, 0)
-        self.master.mav.mission_item_reached_send(self.__item)
+        if self.__changed('position', (self.model.x, self.model.y, self.model.z)):
+            self.master.mav.local_position_ned_send(self.__engine.clock.time_boot_ms(), self.model.x, self.model.y, self.model.z, 0, 0, 0)
+
+    def __mission_send(self):
+        self.master.mav.srcComponent = 26
+        if self.__changed('mission', (self.model.motion.reached,)):
+            self.master.mav.mission_item_reached_send(self.model.motion.reached)
 
     def __distance_sensor_send(self, type):
         if type == common.MAV_DISTANCE_SENSOR_UNKNOWN:
             distance = int(self.model.get_temp())
         elif type == common.MAV_DISTANCE_SENSOR_LASER:
             distance = self.model.z
+        if not self.__changed(f'sensor{type}', (distance,)):
+            return
         self.master.mav.distance_sensor_send(
-            time_boot_ms = int(time()),
+            time_boot_ms = self.__engine.clock.time_boot_ms(),
             min_distance = 0,
             max_distance = 100,
             current_distance = distance,
@@ -172,14 +274,43 @@ class DroneMavlinkModel(Model):
             covariance = 0
         )
 
-    def __live_handler(self):
-        while self.online:
-            self.__status_send()
-            sleep(self.heartbeat_rate / 3)
-            self.__distance_sensor_send(common.MAV_DISTANCE_SENSOR_UNKNOWN)
-            sleep(self.heartbeat_rate / 3)
-            self.__heartbeat_send()
-            sleep(self.heartbeat_rate / 3)
+    def __set_rate(self, name : str, rate : float):
+        self.__rates[name] = rate
+        if rate > 0:
+            self.__telemetry.schedule(self, name, 1 / rate, self.__streams[name])
+        else:
+            self.__telemetry.cancel(self, name)
+
+    def __set_message_interval(self, message : int, interval : float) -> bool:
+        name = self.STREAMS.get(message)
+        if name is None:
+            return False
+        if interval == 0:
+            self.__set_rate(name, self.__default_rates[name])
+        elif interval < 0:
+            self.__set_rate(name, 0)
+        else:
+            self.__set_rate(name, 1e6 / interval)
+        return True
+
+    def __live_handler(self, master, model):
+        if not self.online or model is not self.model:
+            self.__shutdown(master, model)
+        elif model.get_battery() <= self.__battery_off:
+            self.online = False
+            self.__telemetry.cancel(self)
+            model.inprogress = False
+            model.landing(partial(self.__shutdown, master, model))
+
+    def __shutdown(self, master, model):
+        with self.__session_lock:
+            if self.__session is None or self.__session[0] is not master:
+                return
+            self.__session = None
+        print(f'{self.hostname}:{self.port} offline')
+        self.__telemetry.cancel(self)
+        master.close()
+        model.stop()
 
     def __command_ack_send(self, command : int):
         self.master.mav.command_ack_send(
@@ -200,142 +331,117 @@ class DroneMavlinkModel(Model):
         )
 
     def __go_to_point_target(self, x : float, y : float, z : float, yaw : float):
-        if self.model.inprogress:
-            self.model.inprogress = False
-            sleep(0.025)
-        self.model.inprogress = True
         self.model.set_pos(x, y, z, yaw)
-        self.model.update_yaw(yaw)
-        self.model.go_to_point(x, y, z)
-        if self.model.inprogress:
-            self.__item += 1
-        self.model.inprogress = False
+        self.model.set_target(x, y, z, yaw)
+
+    @staticmethod
+    def __stick(value : int) -> float:
+        if value == 0 or value == 65535:
+            return 0.0
+        return max(-1.0, min(1.0, (value - 1500) / 500))
+
+    def __point_reached(self):
         self.model.set_pos(-1, -1, -1, -1)
         
-    def __message_handler(self):
+    def __message_handler(self, msg):
+        if not self.online or self.model.get_battery() <= self.__battery_off:
+            return
         try:
-            takeoff_once = False
-            landing_once = False
-            while self.online:
-                if self.model.get_battery() > self.__battery_off:
-                    msg = self.master.recv_match(timeout=0.1)
-                    if msg is not None:
-                        if msg.get_type() == "COMMAND_LONG":
-                            if msg.command == 400: # preflight and disarm
-                                if not self.model.preflight_status:
-                                    self.__command_ack_send(msg.command)
-                                    self.model.preflight_status = True
-                                else:
-                                    self.model.disarm()
-                                    self.__command_ack_send(msg.command)
-                            elif msg.command == 22: # takeoff
-                                if not self.model.takeoff_status:
-                                    if not self.model.inprogress:
-                                        if not takeoff_once:
-                                            Thread(target=self.model.takeoff).start()
-                                            takeoff_once = True
-                                    else:
-                                        self.__comand_inprogress_send(msg.command)
-                                else:
-                                    if takeoff_once:
-                                        self.__command_ack_send(msg.command)
-                                        takeoff_once = False
-                                    else:
-                                        self.__command_denied_send(msg.command)
-                            elif msg.command == 21: # landing
-                                if self.model.takeoff_status:
-                                    if not self.model.inprogress:
-                                        if not landing_once:
-                                            Thread(target=self.model.landing).start()
-                                            landing_once = True
-                                    else:
-                                        self.__comand_inprogress_send(msg.command)
-                                else:
-                                    if landing_once:
-                                        self.__command_ack_send(msg.command)
-                                        landing_once = False
-                                    else:
-                                        self.__command_denied_send(msg.command)
-                            elif msg.command == 31010: # led control
-                                self.model.set_color(msg.param2, msg.param3, msg.param4)
-                                self.__command_ack_send(msg.command)
-                        elif msg.get_type() == "SET_POSITION_TARGET_LOCAL_NED":
-                            if self.model.check_pos(msg.x, msg.y, msg.z, msg.yaw):
-                                self.master.mav.srcComponent = 1
-                                self.master.mav.position_target_local_ned_send(
-                                    time_boot_ms = 0,
-                                    coordinate_frame = msg.coordinate_frame,
-                                    type_mask = msg.type_mask,
-                                    x = msg.x,
-                                    y = msg.y,
-                                    z = msg.z,
-                                    vx = msg.vx,
-                                    vy = msg.vy,
-                                    vz = msg.vz,
-                                    afx = msg.afx,
-                                    afy = msg.afy,
-                                    afz = msg.afz,
-                                    yaw_rate = msg.yaw_rate,
-                                    yaw = msg.yaw
-                                )
-                                Thread(target=self.__go_to_point_target, args=(msg.x, msg.y, msg.z, msg.yaw)).start()
-                        elif msg.get_type() == "RC_CHANNELS_OVERRIDE":
-                            channel_1 = msg.chan1_raw
-                            channel_2 = msg.chan2_raw
-                            channel_3 = msg.chan3_raw
-                            channel_4 = msg.chan4_raw
-
-                            delta_x = 0.0
-                            delta_y = 0.0
-                            delta_z = 0.0
-                            delta_yaw = 0.0
-
-                            drone_x = 0.0
-                            drone_y = 0.0
-
-                            if channel_2 < 1500:
-                                delta_yaw = 5
-                            elif channel_2 > 1500:
-                                delta_yaw = -5
-
-                            if channel_4 < 1500:
-                                drone_x = -0.05
-                            elif channel_4 > 1500:
-                                drone_x = 0.05
-
-                            if channel_3 < 1500:
-                                drone_y = -0.05
-                            elif channel_3 > 1500:
-                                drone_y = 0.05
-
-                            x1 = drone_y * sin(radians(360 - self.model.yaw + delta_yaw))
-                            y1 = drone_y * cos(radians(360 - self.model.yaw + delta_yaw))
-
-                            x2 = drone_x * cos(radians(self.model.yaw + delta_yaw))
-                            y2 = drone_x * sin(radians(self.model.yaw + delta_yaw))
-
-                            delta_x = x1 + x2
-                            delta_y = y1 + y2
-
-                            if channel_1 < 1500:
-                                delta_z = -0.05
-                            elif channel_1 > 1500:
-                                delta_z = 0.05
-
-                            self.__go_to_point_target(self.model.x + delta_x, self.model.y + delta_y, self.model.z + delta_z, delta_yaw)
-                            sleep(0.0001)
-                else:
-                    if self.model.inprogress:
-                        self.model.inprogress = False
-                        sleep(0.025)
-                    Thread(target=self.model.landing).start()
-                    break
+            if msg.get_type() == "COMMAND_LONG":
+                if msg.command == 400: # preflight and disarm
+                    if not self.model.preflight_status:
+                        self.__command_ack_send(msg.command)
+                        self.model.preflight_status = True
+                    else:
+                        self.model.disarm()
+                        self.__command_ack_send(msg.command)
+                elif msg.command == 22: # takeoff
+                    if not self.model.takeoff_status:
+                        if not self.model.inprogress:
+                            if not self.__takeoff_once:
+                                self.model.takeoff()
+                                self.__takeoff_once = True
+                        else:
+                            self.__comand_inprogress_send(msg.command)
+                    else:
+                        if self.__takeoff_once:
+                            self.__command_ack_send(msg.command)
+                            self.__takeoff_once = False
+                        else:
+                            self.__command_denied_send(msg.command)
+                elif msg.command == 21: # landing
+                    if self.model.takeoff_status:
+                        if not self.model.inprogress:
+                            if not self.__landing_once:
+                                self.model.landing()
+                                self.__landing_once = True
+                        else:
+                            self.__comand_inprogress_send(msg.command)
+                    else:
+                        if self.__landing_once:
+                            self.__command_ack_send(msg.command)
+                            self.__landing_once = False
+                        else:
+                            self.__command_denied_send(msg.command)
+                elif msg.command == 31010: # led control
+                    self.model.set_color(msg.param2, msg.param3, msg.param4)
+                    self.__command_ack_send(msg.command)
+                elif msg.command == 511: # set message interval
+                    if self.__set_message_interval(int(msg.param1), msg.param2):
+                        self.__command_ack_send(msg.command)
+                    else:
+                        self.__command_denied_send(msg.command)
+            elif msg.get_type() == "REQUEST_DATA_STREAM":
+                for name in self.DATA_STREAMS.get(msg.req_stream_id, ()):
+                    if msg.start_stop:
+                        self.__set_rate(name, msg.req_message_rate if msg.req_message_rate > 0 else self.__default_rates[name])
+                    else:
+                        self.__set_rate(name, 0)
+            elif msg.get_type() == "SET_POSITION_TARGET_LOCAL_NED":
+                if self.model.maneuver:
+                    self.__comand_inprogress_send(msg.get_msgId())
+                elif self.model.check_pos(msg.x, msg.y, msg.z, msg.yaw):
+                    self.master.mav.srcComponent = 1
+                    self.master.mav.position_target_local_ned_send(
+                        time_boot_ms = 0,
+                        coordinate_frame = msg.coordinate_frame,
+                        type_mask = msg.type_mask,
+                        x = msg.x,
+                        y = msg.y,
+                        z = msg.z,
+                        vx = msg.vx,
+                        vy = msg.vy,
+                        vz = msg.vz,
+                        afx = msg.afx,
+                        afy = msg.afy,
+                        afz = msg.afz,
+                        yaw_rate = msg.yaw_rate,
+                        yaw = msg.yaw
+                    )
+                    self.__go_to_point_target(msg.x, msg.y, msg.z, msg.yaw)
+            elif msg.get_type() == "RC_CHANNELS_OVERRIDE" and not self.model.maneuver:
+                speed = self.model.speed * PhysicsEngine.STEP
+                self.model.drive(
+                    self.__stick(msg.chan4_raw) * speed,
+                    self.__stick(msg.chan3_raw) * speed,
+                    self.__stick(msg.chan1_raw) * speed,
+                    -self.__stick(msg.chan2_raw) * self.model.speed,
+                    self.RC_TIMEOUT
+                )
+            elif msg.get_type() == "TIMESYNC":
+                if msg.tc1 == 0:
+                    self.master.mav.timesync_send(int(self.__engine.clock.time() * 1e9), msg.ts1)
+            elif msg.get_type() == "SYSTEM_TIME":
+                if self.__engine.lockstep:
+                    self.__engine.advance_to(msg.time_boot_ms / 1000)
+                    self.__engine.call_later(
+                        msg.time_boot_ms / 1000 - self.__engine.clock.time(),
+                        lambda: self.master.mav.system_time_send(msg.time_unix_usec, self.__engine.clock.time_boot_ms())
+                    )
         except Exception as e:
             print(str(e))
+            metrics.handler_errors.inc(1, msg.get_type())
             self.online = False
-        print(f'{self.hostname}:{self.port} offline')
-        self.master.close()
-        self.model.stop()
 
     def set_speed(self, speed : int):
         if self.model is not None:
@@ -377,22 +483,34 @@ class DroneMavlinkModel(Model):
     def get_temp(self) -> float:
         return self.model.get_temp()
     
-    def set_temp(self, id, temp):
-        self.model.set_temp(id, temp)
+    def set_temp(self, temp : float):
+        self.model.set_temp(temp)
     
     def start(self):
-        self.model = SimpleDroneModel(*self.__start_position, 0, self.__speed, self.__battery_need, self.__battery_capacity, self.__battery_max)
-        self.master = mavutil.mavlink_connection(f'udpin:{self.hostname}:{self.port}', source_component=26, dialect = 'common')
+        if self.__shard is not None:
+            self.model = self.__shard.start(self.hostname, self.port, self.__start_position)
+            self.model.offline.connect(self.__remote_offline)
+            self.__online = True
+            return
+        if self.__session is not None:
+            self.__shutdown(*self.__session)
+        if self.__engine is None:
+            self.__engine = PhysicsEngine()
+        self.model = SimpleDroneModel(*self.__start_position, 0, self.__speed, self.__battery_need, self.__battery_capacity, self.__battery_max, self.__engine)
+        self.model.motion.finished.connect(self.__point_reached)
+        if self.__reactor is None:
+            self.__reactor = MavlinkReactor()
+        if self.__telemetry is None:
+            self.__telemetry = TelemetryScheduler(self.__engine)
+        self.__takeoff_once = False
+        self.__landing_once = False
+        self.__sent = {}
+        self.master = self.__reactor.open(self.hostname, self.port, self.__message_handler)
         self.online = True
-
-        self.__live_thread = Thread(target=self.__live_handler)
-        self.__live_thread.daemon = True
-
-        self.__message_thread = Thread(target=self.__message_handler)
-        self.__message_thread.daemon = True
-
-        self.__live_thread.start()
-        self.__message_thread.start()
+        self.__session = (self.master, self.model)
+        self.__telemetry.schedule(self, 'live', self.heartbeat_rate, partial(self.__live_handler, self.master, self.model))
+        for name, rate in self.__default_rates.items():
+            self.__set_rate(name, rate)
 
     @classmethod
     def pack(cls, data) -> dict:
@@ -1,6 +1,8 @@
 from math import hypot
 from pioneersim.simulation.model import Model
+from pioneersim.simulation.plugins import register
 
+@register('models')
 class FireModel(Model):
     def __init__(self, id = 0, x = 0.0, y = 0.0, min_temp = 20.0, max_temp = 60.0, radius = 0.5):
         self.id = id
@@ -18,9 +20,7 @@ class FireModel(Model):
         return {"min_temp" : self.__min_temp, "max_temp" : self.__max_temp}
 
     def get_temp(self, position, static = True):
-        dist = lambda p1, p2: hypot((p2[0] - p1[0]), (p2[1] - p1[1]))
-
-        distance = dist(position, (self.x , self.y))
+        distance = hypot(self.x - position[0], self.y - position[1])
 
         if distance >= self.__radius:
             return self.__min_temp
@@ -1,6 +1,8 @@
 from pioneersim.widgets.dialog import ObjectDialogLoader
 from PyQt5.QtWidgets import QWidget, QLineEdit, QHBoxLayout, QLabel
+from pioneersim.simulation.plugins import register
 
+@register('widgets')
 class DroneDialogLoader(ObjectDialogLoader):
 
     @classmethod
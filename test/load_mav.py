@@ -0,0 +1,291 @@
+import json, selectors, socket, sys
+from argparse import ArgumentParser
+from statistics import mean
+from time import monotonic, sleep
+from pymavlink.dialects.v20 import common
+
+COMMANDS = {
+    'arm' : 400,
+    'takeoff' : 22,
+    'land' : 21,
+    'led' : 31010
+}
+
+DEFAULT_SCRIPT = [
+    {'action' : 'arm'},
+    {'action' : 'takeoff'},
+    {'action' : 'goto', 'x' : 1.0, 'y' : 0.0, 'z' : 1.0, 'yaw' : 0.0},
+    {'action' : 'goto', 'x' : 1.0, 'y' : 1.0, 'z' : 1.0, 'yaw' : 0.0},
+    {'action' : 'rc', 'channels' : [1500, 1500, 1700, 1500], 'duration' : 1.0},
+    {'action' : 'wait', 'duration' : 1.0},
+    {'action' : 'land'}
+]
+
+RETRIED = ('takeoff', 'land')
+
+TELEMETRY = ('HEARTBEAT', 'LOCAL_POSITION_NED', 'DISTANCE_SENSOR', 'MISSION_ITEM_REACHED')
+
+class LoadDrone:
+    def __init__(self, hostname : str, port : int, script : list, retry : float, timeout : float, rc_rate : float):
+        self.hostname = hostname
+        self.port = port
+        self.script = script
+        self.retry = retry
+        self.timeout = timeout
+        self.rc_period = 1 / rc_rate
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.mav = common.MAVLink(None, 255, 190)
+        self.mav.robust_parsing = True
+        self.latencies = {}
+        self.errors = []
+        self.telemetry = dict.fromkeys(TELEMETRY, 0)
+        self.first_message = None
+        self.last_message = None
+        self.position = None
+        self.origin = None
+        self.reached = 0
+        self.done = False
+        self.__step = -1
+        self.__step_start = 0.0
+        self.__step_sent = 0.0
+        self.__next_send = 0.0
+        self.__next_heartbeat = 0.0
+        self.__reached_before = 0
+        self.__echoed = False
+
+    def __send(self, msg):
+        try:
+            self.socket.sendto(msg.pack(self.mav), (self.hostname, self.port))
+        except OSError as e:
+            self.errors.append(f'send: {e}')
+
+    def __record(self, name : str, latency : float):
+        self.latencies.setdefault(name, []).append(latency)
+
+    def __fail(self, step : dict, reason : str):
+        self.errors.append(f'step {self.__step} ({step["action"]}): {reason}')
+
+    def __advance(self, now : float):
+        self.__step += 1
+        self.__step_start = now
+        self.__step_sent = 0.0
+        self.__next_send = now
+        self.__echoed = False
+        self.__reached_before = self.reached
+        if self.__step >= len(self.script):
+            self.done = True
+
+    def start(self, now : float):
+        self.__send(common.MAVLink_heartbeat_message(common.MAV_TYPE_GCS, common.MAV_AUTOPILOT_INVALID, 0, 0, 0, 3))
+        self.__next_heartbeat = now + 1.0
+        self.__advance(now)
+
+    def receive(self, now : float):
+        while True:
+            try:
+                data = self.socket.recv(65535)
+            except OSError:
+                return
+            for msg in self.mav.parse_buffer(data) or []:
+                self.__handle(msg, now)
+
+    def __handle(self, msg, now : float):
+        kind = msg.get_type()
+        if self.first_message is None:
+            self.first_message = now
+        self.last_message = now
+        if kind in self.telemetry:
+            self.telemetry[kind] += 1
+        if kind == 'LOCAL_POSITION_NED':
+            self.position = (msg.x, msg.y, msg.z)
+        elif kind == 'MISSION_ITEM_REACHED':
+            self.reached = max(self.reached, msg.seq)
+        if self.done:
+            return
+        step = self.script[self.__step]
+        action = step['action']
+        if kind == 'COMMAND_ACK' and action in COMMANDS and msg.command == COMMANDS[action]:
+            if msg.result == common.MAV_RESULT_ACCEPTED:
+                self.__record(action, now - self.__step_sent)
+                self.__advance(now)
+            elif msg.result == common.MAV_RESULT_DENIED:
+                self.__fail(step, 'denied')
+                self.__advance(now)
+        elif kind == 'POSITION_TARGET_LOCAL_NED' and action == 'goto' and not self.__echoed:
+            self.__echoed = True
+            self.__record('goto_echo', now - self.__step_sent)
+        elif kind == 'MISSION_ITEM_REACHED' and action == 'goto' and self.__echoed and msg.seq > self.__reached_before:
+            self.__record('goto_reached', now - self.__step_sent)
+            self.__advance(now)
+
+    def poll(self, now : float) -> float:
+        if now >= self.__next_heartbeat:
+            self.__send(common.MAVLink_heartbeat_message(common.MAV_TYPE_GCS, common.MAV_AUTOPILOT_INVALID, 0, 0, 0, 3))
+            self.__next_heartbeat = now + 1.0
+        if self.done:
+            return self.__next_heartbeat
+        step = self.script[self.__step]
+        action = step['action']
+        if action in ('wait', 'rc') and now - self.__step_start >= step.get('duration', 0.0):
+            self.__advance(now)
+            return now
+        if action not in ('wait', 'rc') and now - self.__step_start >= self.timeout:
+            self.__fail(step, f'no response in {self.timeout} s')
+            self.__advance(now)
+            return now
+        if now < self.__next_send:
+            return min(self.__next_send, self.__next_heartbeat)
+        if action in COMMANDS:
+            params = step.get('params', [1 if action == 'arm' else 0, 0, 0, 0, 0, 0, 0])
+            self.__send(common.MAVLink_command_long_message(1, 1, COMMANDS[action], 0, *params))
+            self.__next_send = now + (self.retry if action in RETRIED else self.timeout)
+        elif action == 'goto':
+            if self.position is None:
+                self.__next_send = now + self.retry
+                return self.__next_send
+            if self.origin is None:
+                self.origin = self.position
+            if self.__echoed:
+                self.__next_send = now + self.timeout
+                return min(self.__next_send, self.__next_heartbeat)
+            self.__send(common.MAVLink_set_position_target_local_ned_message(
+                0, 1, 1, common.MAV_FRAME_LOCAL_NED, 0,
+                self.origin[0] + step.get('x', 0.0), self.origin[1] + step.get('y', 0.0), step.get('z', 1.0),
+                0, 0, 0, 0, 0, 0, step.get('yaw', 0.0), 0
+            ))
+            self.__next_send = now + self.retry
+        elif action == 'rc':
+            self.__send(common.MAVLink_rc_channels_override_message(1, 1, *step['channels'], 0, 0, 0, 0))
+            self.__next_send = now + self.rc_period
+        else:
+            self.__next_send = now + step.get('duration', 0.0)
+        if self.__step_sent == 0.0:
+            self.__step_sent = now
+        return min(self.__next_send, self.__next_heartbeat)
+
+    def report(self) -> dict:
+        elapsed = None if self.first_message is None else self.last_message - self.first_message
+        return {
+            'port' : self.port,
+            'completed' : self.done and len(self.errors) == 0,
+            'errors' : self.errors,
+            'latency_ms' : {name : [round(value * 1000, 3) for value in values] for name, values in self.latencies.items()},
+            'telemetry_hz' : {kind : round(count / elapsed, 3) if elapsed else 0.0 for kind, count in self.telemetry.items()}
+        }
+
+    def close(self):
+        self.socket.close()
+
+def summarize(values : list) -> dict:
+    if len(values) == 0:
+        return {'count' : 0}
+    values = sorted(values)
+    return {
+        'count' : len(values),
+        'mean' : round(mean(values), 3),
+        'p50' : values[len(values) // 2],
+        'p95' : values[min(int(len(values) * 0.95), len(values) - 1)],
+        'max' : values[-1]
+    }
+
+def parse_ports(text : str) -> list[int]:
+    ports = []
+    for part in text.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            ports += range(int(first), int(last) + 1)
+        elif part != '':
+            ports.append(int(part))
+    return ports
+
+def scenario_ports(path : str) -> list[tuple]:
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines()[1:] if line.strip() != '']
+    return [(record['hostname'], record['port']) for record in records if record.get('type') == 'drone']
+
+def run(endpoints : list, script : list, retry = 0.1, timeout = 30.0, rc_rate = 20.0, stagger = 0.0, deadline = None) -> dict:
+    selector = selectors.DefaultSelector()
+    drones = []
+    start = monotonic()
+    for hostname, port in endpoints:
+        drone = LoadDrone(hostname, port, script, retry, timeout, rc_rate)
+        selector.register(drone.socket, selectors.EVENT_READ, drone)
+        drone.start(monotonic())
+        drones.append(drone)
+        if stagger > 0.0:
+            sleep(stagger)
+    if deadline is None:
+        deadline = timeout * (len(script) + 1)
+    while monotonic() - start < deadline:
+        now = monotonic()
+        wake = now + 0.1
+        active = False
+        for drone in drones:
+            wake = min(wake, drone.poll(now))
+            active = active or not drone.done
+        if not active:
+            break
+        for key, _ in selector.select(max(wake - monotonic(), 0.0)):
+            key.data.receive(monotonic())
+    elapsed = monotonic() - start
+    for drone in drones:
+        drone.close()
+    selector.close()
+
+    reports = [drone.report() for drone in drones]
+    latencies = {}
+    telemetry = {}
+    for report in reports:
+        for name, values in report['latency_ms'].items():
+            latencies.setdefault(name, []).extend(values)
+        for kind, rate in report['telemetry_hz'].items():
+            telemetry.setdefault(kind, []).append(rate)
+    return {
+        'drones' : len(drones),
+        'completed' : sum(report['completed'] for report in reports),
+        'elapsed_s' : round(elapsed, 3),
+        'script' : script,
+        'latency_ms' : {name : summarize(values) for name, values in sorted(latencies.items())},
+        'telemetry_hz' : {kind : {'mean' : round(mean(rates), 3), 'min' : min(rates), 'max' : max(rates)} for kind, rates in telemetry.items()},
+        'per_drone' : reports
+    }
+
+def main(argv : list) -> int:
+    parser = ArgumentParser(prog='test/load_mav.py', description='Drive many PioneerMavSim drones over MAVLink and report latencies')
+    parser.add_argument('--hostname', default='localhost')
+    parser.add_argument('--ports', default='8000', help='e.g. 8000-8099 or 8000,8002')
+    parser.add_argument('--scenario', default=None, help='take drone endpoints from a scenario file')
+    parser.add_argument('--script', default=None, help='JSON list of steps (arm, takeoff, goto, rc, wait, land, led)')
+    parser.add_argument('--retry', type=float, default=0.1)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--rc-rate', type=float, default=20.0)
+    parser.add_argument('--stagger', type=float, default=0.0)
+    parser.add_argument('--output', default=None, help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.scenario is not None:
+        endpoints = scenario_ports(args.scenario)
+    else:
+        endpoints = [(args.hostname, port) for port in parse_ports(args.ports)]
+    script = DEFAULT_SCRIPT
+    if args.script is not None:
+        with open(args.script, 'r') as f:
+            script = json.load(f)
+
+    report = run(endpoints, script, args.retry, args.timeout, args.rc_rate, args.stagger)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"{report['completed']}/{report['drones']} drones completed the script in {report['elapsed_s']} s", file=sys.stderr)
+    return 0 if report['completed'] == report['drones'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))